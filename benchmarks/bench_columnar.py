@@ -0,0 +1,107 @@
+"""Per-row versus columnar throughput for the name and introduction nodes.
+
+Per row, each person goes through a CreateName and a CreateIntroduction execution, with capitalize_name run on each
+value the way the engine runs converters when it sets a parameter. Batched, CreateNameBatch and CreateIntroductionBatch
+each run once over whole columns, with capitalize_names and clamp_ages as their column converters. If NumPy is
+installed, the same columnar work done with numpy.strings operations is timed for reference. Parameter values are
+Python lists, and converting them to arrays and back costs more than the vectorized ops save, which is why the nodes
+use plain list operations instead.
+
+Only node-side work is timed; in a real flow every per-row execution also pays the engine's scheduling overhead.
+
+Run from the repository root:
+    python benchmarks/bench_columnar.py [rows]
+"""
+import random
+import sys
+import time
+
+import library_path  # noqa: F401
+import memoization
+from ages import AGE_MAX, AGE_MIN, clamp_ages
+from create_introduction import CreateIntroduction, CreateIntroductionBatch
+from create_name import CreateName, CreateNameBatch, capitalize_name, capitalize_names
+
+FIRST = ["ada", "grace", "alan", "katherine", "linus", "margaret", "dennis", "barbara"]
+LAST = ["lovelace", "hopper", "turing", "johnson", "torvalds", "hamilton", "ritchie", "liskov"]
+
+
+def make_columns(rows:int, seed:int=0) -> tuple[list, list, list]:
+    rng = random.Random(seed)
+    # A few ages fall outside Age's range, so clamping has work to do
+    return [rng.choice(FIRST) for _ in range(rows)], [rng.choice(LAST) for _ in range(rows)], [rng.randint(-5, 120) for _ in range(rows)]
+
+
+def per_row(first_names:list, last_names:list, ages:list) -> list:
+    name_node = CreateName(name="name")
+    intro_node = CreateIntroduction(name="intro")
+    results = []
+    for first, last, age in zip(first_names, last_names, ages):
+        name_node.parameter_values["first name"] = capitalize_name(first)
+        name_node.parameter_values["last name"] = capitalize_name(last)
+        name_node.process()
+        intro_node.parameter_values["full name"] = name_node.parameter_output_values["full name"]
+        intro_node.parameter_values["age"] = min(max(age, AGE_MIN), AGE_MAX)
+        intro_node.process()
+        results.append(intro_node.parameter_output_values["introduction"])
+    return results
+
+
+def batched(first_names:list, last_names:list, ages:list) -> list:
+    name_node = CreateNameBatch(name="names")
+    intro_node = CreateIntroductionBatch(name="intros")
+    name_node.parameter_values["first names"] = capitalize_names(first_names)
+    name_node.parameter_values["last names"] = capitalize_names(last_names)
+    name_node.process()
+    intro_node.parameter_values["full names"] = name_node.parameter_output_values["full names"]
+    intro_node.parameter_values["ages"] = clamp_ages(ages)
+    intro_node.process()
+    return intro_node.parameter_output_values["introductions"]
+
+
+def numpy_columns(first_names:list, last_names:list, ages:list) -> list:
+    # numpy.strings needs NumPy 2.3 or newer for slice()
+    import numpy as np
+    strings = np.strings
+
+    def capitalize(values:list):
+        column = np.array(values)
+        return strings.add(strings.upper(strings.slice(column, 0, 1)), strings.slice(column, 1, None))
+
+    full = strings.add(strings.add(capitalize(first_names), " "), capitalize(last_names))
+    clamped = np.clip(np.array(ages), AGE_MIN, AGE_MAX).astype(str)
+    intro = strings.add(strings.add(strings.add(strings.add("Hey! My name is ", full), ", and I'm "), clamped), " years old.")
+    return intro.tolist()
+
+
+def timed(function, *args) -> tuple[float, list]:
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    # Every row differs, so memoization would only add fingerprinting to the per-row side
+    memoization.configure(enabled=False)
+    columns = make_columns(rows)
+    row_seconds, expected = timed(per_row, *columns)
+    batch_seconds, result = timed(batched, *columns)
+    if result != expected:
+        raise SystemExit("batched output differs from per-row output")
+
+    print(f"{rows} people")
+    print(f"per-row node executions: {row_seconds:7.3f}s  {rows / row_seconds:12,.0f} rows/s")
+    print(f"columnar batch nodes:    {batch_seconds:7.3f}s  {rows / batch_seconds:12,.0f} rows/s  ({row_seconds / batch_seconds:.1f}x)")
+    try:
+        numpy_seconds, numpy_result = timed(numpy_columns, *columns)
+    except (ImportError, AttributeError):
+        print("numpy.strings reference: needs NumPy 2.3+")
+        return
+    if numpy_result != expected:
+        raise SystemExit("numpy output differs from per-row output")
+    print(f"numpy.strings reference: {numpy_seconds:7.3f}s  {rows / numpy_seconds:12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Per-run latency of NasaImageSearchNode with the shared pooled session versus a new connection per request.
+
+Uses a local stand-in NASA server, so no network access is needed. Localhost connections are cheap; against the
+real HTTPS API the saving per run also includes the TLS handshake.
+
+Run from the repository root:
+    python benchmarks/bench_http_session.py [runs]
+"""
+import sys
+import time
+from unittest import mock
+
+import requests
+
+import library_path  # noqa: F401
+import nasa_image_search
+from nasa_image_search import NasaImageSearchNode
+
+from fake_servers import FakeNasaServer
+
+
+class _FreshConnectionSession:
+    # Stands in for the old behaviour: module-level requests.get opens a new connection every call.
+    def get(self, *args, **kwargs):
+        return requests.get(*args, **kwargs)
+
+
+def run(node:NasaImageSearchNode, runs:int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        node.process()
+        if node.parameter_output_values["error_message"]:
+            raise SystemExit(node.parameter_output_values["error_message"])
+    return (time.perf_counter() - start) / runs
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    node = NasaImageSearchNode(name="bench")
+    # Caching off, so every run makes both requests
+    node.parameter_values["use_cache"] = False
+    with FakeNasaServer() as server, mock.patch.object(nasa_image_search, "NASA_API_URL", f"{server.url}/search"):
+        with mock.patch.object(nasa_image_search, "get_session", _FreshConnectionSession):
+            fresh = run(node, runs)
+        fresh_connections = server.counts["connections"]
+        pooled = run(node, runs)
+        pooled_connections = server.counts["connections"] - fresh_connections
+
+    print(f"{runs} runs against {server.url}")
+    print(f"new connection per request: {fresh * 1000:7.2f} ms/run  {fresh_connections} connections")
+    print(f"shared session:             {pooled * 1000:7.2f} ms/run  {pooled_connections} connections")
+    print(f"saved per run:              {(fresh - pooled) * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Repeated NasaImageSearchNode runs with and without the on-disk image cache.
+
+Compares downloading the preview every run, serving it from a fresh cache entry, and revalidating a stale entry
+with If-None-Match against a local stand-in NASA server.
+
+Run from the repository root:
+    python benchmarks/bench_image_cache.py [runs]
+"""
+import sys
+import tempfile
+import time
+from unittest import mock
+
+import library_path  # noqa: F401
+import nasa_image_search
+from image_cache import ImageCache
+from nasa_image_search import NasaImageSearchNode
+
+from fake_servers import FakeNasaServer
+
+
+def run(server:FakeNasaServer, runs:int, use_cache:bool, max_age:float) -> tuple[float, int]:
+    node = NasaImageSearchNode(name="bench")
+    node.parameter_values["use_cache"] = use_cache
+    downloads = server.counts["images"]
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ImageCache(directory, max_age=max_age)
+        with mock.patch.object(nasa_image_search, "get_image_cache", lambda: cache):
+            start = time.perf_counter()
+            for _ in range(runs):
+                node.process()
+                if node.parameter_output_values["error_message"]:
+                    raise SystemExit(node.parameter_output_values["error_message"])
+            seconds = time.perf_counter() - start
+    return seconds / runs, server.counts["images"] - downloads
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with FakeNasaServer(image_size=(1920, 1080), latency=0.005) as server, mock.patch.object(nasa_image_search, "NASA_API_URL", f"{server.url}/search"):
+        print(f"{runs} runs, {len(server.image) / 1024:.0f} KB preview, 5 ms server latency")
+        for label, use_cache, max_age in (("no cache", False, 0), ("revalidate", True, 0), ("fresh hits", True, 3600)):
+            seconds, requests = run(server, runs, use_cache, max_age)
+            print(f"{label:10s}  {seconds * 1000:7.2f} ms/run  {requests:4d} image requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Peak RSS of downloading one large NASA preview, before and after streaming into a bounded buffer.
+
+"legacy" reproduces the old download (img_response.content plus a BytesIO copy for Pillow); "streamed" runs
+NasaImageSearchNode. Each mode runs in a fresh child process, and the peak is reset after imports, so the
+reported number only reflects the download. Linux only: it relies on /proc/self/clear_refs and VmHWM.
+
+Run from the repository root:
+    python benchmarks/bench_image_memory.py [megapixels]
+"""
+import subprocess
+import sys
+from io import BytesIO
+
+import library_path  # noqa: F401
+
+from fake_servers import FakeNasaServer
+
+
+def reset_peak_rss() -> None:
+    # Writing 5 to clear_refs resets the process's peak RSS (VmHWM) to its current RSS.
+    with open("/proc/self/clear_refs", "w") as handle:
+        handle.write("5")
+
+
+def peak_rss_mb() -> float:
+    with open("/proc/self/status") as handle:
+        for line in handle:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("VmHWM not available")
+
+
+def legacy(search_url:str) -> None:
+    import requests
+    from PIL import Image
+
+    items = requests.get(search_url, params={"q": "apollo", "page_size": 1}, timeout=10).json()["collection"]["items"]
+    response = requests.get(items[0]["links"][0]["href"], stream=True, timeout=60)
+    image_bytes = response.content
+    with Image.open(BytesIO(image_bytes)) as img:
+        img.size
+
+
+def streamed(search_url:str) -> None:
+    import nasa_image_search
+
+    nasa_image_search.NASA_API_URL = search_url
+    node = nasa_image_search.NasaImageSearchNode(name="bench")
+    node.parameter_values["use_cache"] = False
+    node.parameter_values["max_image_mb"] = 1024
+    node.process()
+    if node.parameter_output_values["error_message"]:
+        raise SystemExit(node.parameter_output_values["error_message"])
+
+
+def child(mode:str, search_url:str) -> None:
+    # Import everything first so the baseline includes library code, not just the interpreter.
+    import requests  # noqa: F401
+    from PIL import Image  # noqa: F401
+    import nasa_image_search  # noqa: F401
+
+    reset_peak_rss()
+    before = peak_rss_mb()
+    {"legacy": legacy, "streamed": streamed}[mode](search_url)
+    print(f"{peak_rss_mb() - before:.1f}")
+
+
+def main() -> None:
+    megapixels = float(sys.argv[1]) if len(sys.argv) > 1 else 64
+    side = int((megapixels * 1_000_000) ** 0.5)
+    with FakeNasaServer(image_size=(side, side), noise=True) as server:
+        size_mb = len(server.image) / 1024 / 1024
+        results = {}
+        for mode in ("legacy", "streamed"):
+            output = subprocess.run([sys.executable, __file__, "--child", mode, f"{server.url}/search"], capture_output=True, text=True, check=True)
+            results[mode] = float(output.stdout.strip().splitlines()[-1])
+    print(f"image: {side}x{side}, {size_mb:.1f} MB")
+    print(f"legacy:   peak RSS +{results['legacy']:7.1f} MB")
+    print(f"streamed: peak RSS +{results['streamed']:7.1f} MB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -0,0 +1,95 @@
+"""Time taken to register the node library, and a guard against heavy imports creeping back in.
+
+Each run starts a fresh interpreter with -X importtime, imports the griptape_nodes base classes (the engine has
+those loaded already), then loads every node file listed in library.json the way the engine does. The script exits
+non-zero if registration imports one of HEAVY_MODULES or the median load time goes over the budget.
+
+The time covers only what the library adds on top of those base classes. Importing the base classes is left out,
+and on a real engine it isn't free (griptape_nodes' node_types already pulls in griptape.events), so the numbers
+are not the engine's total registration time. Only compare runs made against the same griptape_nodes install.
+
+Run from the repository root:
+    python benchmarks/bench_import_time.py [runs] [budget_ms]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import library_path
+
+# Only needed once a node runs; node files must bind these with lazy_imports.lazy_import()
+HEAVY_MODULES = ("openai", "requests", "urllib3", "PIL.Image", "griptape.structures", "griptape.drivers.prompt.openai")
+
+_CHILD = """
+import importlib.util, json, sys, time
+from pathlib import Path
+import griptape_nodes.exe_types.node_types, griptape_nodes.exe_types.core_types
+import griptape_nodes.traits.minmax, griptape_nodes.traits.clamp
+library_dir = Path(sys.argv[1])
+sys.path.insert(0, str(library_dir))
+before = set(sys.modules)
+files = {}
+start = time.perf_counter()
+for node in json.loads((library_dir / "library.json").read_text())["nodes"]:
+    path = library_dir / node["file_path"]
+    if str(path) in files:
+        continue
+    file_start = time.perf_counter()
+    spec = importlib.util.spec_from_file_location(f"dynamic_module_{path.stem}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    files[str(path)] = time.perf_counter() - file_start
+total = time.perf_counter() - start
+print(json.dumps({"total": total, "files": files, "imported": sorted(set(sys.modules) - before)}))
+"""
+
+
+def run_once() -> tuple[dict, list[tuple[int, str]]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD, str(library_path.LIBRARY_DIR)],
+        capture_output=True, text=True, check=True, env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+    # importtime lines look like "import time:  self [us] | cumulative | imported package"
+    report = json.loads(result.stdout)
+    imported = set(report["imported"])
+    cumulative = []
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, total, name = line[len("import time:"):].split("|")
+            # Skip interpreter startup and the griptape_nodes imports, which aren't the library's doing
+            if name.strip() in imported:
+                cumulative.append((int(total), name.strip()))
+    return report, cumulative
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    budget_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 250.0
+    results = [run_once() for _ in range(runs)]
+    totals = [report["total"] * 1000 for report, _ in results]
+    median = statistics.median(totals)
+    report, cumulative = results[-1]
+
+    print(f"library registration, {runs} runs: median {median:.1f} ms  min {min(totals):.1f} ms  max {max(totals):.1f} ms")
+    for path, seconds in sorted(report["files"].items(), key=lambda item: -item[1]):
+        print(f"  {os.path.basename(path):24s} {seconds * 1000:7.2f} ms")
+    print("slowest imports (cumulative):")
+    for total, name in sorted(cumulative, reverse=True)[:10]:
+        print(f"  {total / 1000:7.2f} ms  {name}")
+
+    failures = []
+    heavy = [name for name in HEAVY_MODULES if name in report["imported"]]
+    if heavy:
+        failures.append(f"registration imported heavy modules: {', '.join(heavy)}")
+    if median > budget_ms:
+        failures.append(f"median registration time {median:.1f} ms is over the {budget_ms:.0f} ms budget")
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Overhead of @instrumented on a trivial node, and the metrics it records for network-bound nodes.
+
+Times Age.process() undecorated, with metrics off, with the in-process registry, and with the JSON-lines sink. Then
+runs the NASA and OpenAI nodes against the local stand-in servers with metrics on and prints the registry.
+
+Run from the repository root:
+    python benchmarks/bench_instrumentation.py [runs]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+import library_path  # noqa: F401
+import instrumentation
+import memoization
+import nasa_image_search
+from age_node import Age
+from nasa_image_search import NasaImageSearchNode
+from openai_chat import OpenAIChat, OpenAIChatBatch
+
+from fake_servers import FakeNasaServer, FakeOpenAIServer
+
+
+def per_run_ns(function, runs:int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(runs):
+        function()
+    return (time.perf_counter_ns() - start) / runs
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    node = Age(name="bench")
+    node.parameter_values["age"] = 36
+    # The function @instrumented wraps, so the difference is the instrumentation alone
+    undecorated = Age.process.__wrapped__
+    # Every run has the same inputs; with memoization on this would time cache hits instead of the decorator
+    memoization.configure(enabled=False)
+
+    with tempfile.TemporaryDirectory() as directory:
+        sink = Path(directory) / "runs.jsonl"
+        print(f"Age.process(), {runs} runs")
+        print(f"undecorated:        {per_run_ns(lambda: undecorated(node), runs):8.0f} ns/run")
+        instrumentation.configure(enabled=False)
+        print(f"metrics off:        {per_run_ns(node.process, runs):8.0f} ns/run")
+        instrumentation.configure(enabled=True)
+        print(f"registry:           {per_run_ns(node.process, runs // 10):8.0f} ns/run")
+        instrumentation.configure(metrics_file=sink)
+        print(f"registry + JSONL:   {per_run_ns(node.process, runs // 10):8.0f} ns/run")
+
+        instrumentation.get_registry().reset()
+        with FakeNasaServer() as nasa, FakeOpenAIServer(words=100) as openai, \
+                mock.patch.object(nasa_image_search, "NASA_API_URL", f"{nasa.url}/search"), \
+                mock.patch.dict(os.environ, {"OPENAI_BASE_URL": openai.base_url, "KYRO_NODES_CACHE_DIR": directory}), \
+                mock.patch.object(OpenAIChat, "get_config_value", return_value="sk-bench"), \
+                mock.patch.object(OpenAIChatBatch, "get_config_value", return_value="sk-bench"):
+            search = NasaImageSearchNode(name="search")
+            search.parameter_values.update(query="apollo", result_count=8, use_cache=False)
+            search.process()
+            chat = OpenAIChat(name="chat")
+            chat.parameter_values["prompt"] = "Hello"
+            chat.process()
+            batch = OpenAIChatBatch(name="batch")
+            batch.parameter_values["prompts"] = [f"Prompt {index}" for index in range(6)]
+            batch.process()
+        print(json.dumps({name: stats for name, stats in instrumentation.get_registry().snapshot().items() if name != "Age"}, indent=2))
+        print(f"{sum(1 for _ in sink.open())} lines in the JSON-lines sink")
+        instrumentation.configure(enabled=False)
+
+
+if __name__ == "__main__":
+    main()
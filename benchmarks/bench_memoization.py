@@ -0,0 +1,83 @@
+"""Re-run latency of an unchanged flow with and without input-fingerprint memoization.
+
+The flow is Age and CreateName feeding CreateIntroduction, whose introduction is prepended to a long document and
+converted by ConvertToPigLatin. Outputs are handed downstream as the same objects, the way the engine passes values
+along connections. Each configuration runs the flow once cold and then re-runs it unchanged; a last run changes only
+the age, so everything downstream of Age recomputes while CreateName is still reused.
+
+Run from the repository root:
+    python benchmarks/bench_memoization.py [megabytes] [reruns]
+"""
+import statistics
+import sys
+import time
+
+import library_path  # noqa: F401
+import memoization
+from age_node import Age
+from bench_pig_latin import make_text
+from create_introduction import CreateIntroduction
+from create_name import CreateName
+from pig_latin import ConvertToPigLatin
+
+
+def build_flow() -> dict:
+    return {"age": Age(name="age"), "name": CreateName(name="name"), "intro": CreateIntroduction(name="intro"), "pig": ConvertToPigLatin(name="pig")}
+
+
+def run_flow(nodes:dict, age:int, document) -> str:
+    nodes["age"].parameter_values["age"] = age
+    nodes["age"].process()
+    nodes["name"].parameter_values.update({"first name": "Ada", "last name": "Lovelace"})
+    nodes["name"].process()
+    nodes["intro"].parameter_values["full name"] = nodes["name"].parameter_output_values["full name"]
+    nodes["intro"].parameter_values["age"] = nodes["age"].parameter_output_values["age"]
+    nodes["intro"].process()
+    # The document node upstream would hand over the same string object on every run
+    nodes["pig"].parameter_values["input"] = document(nodes["intro"].parameter_output_values["introduction"])
+    nodes["pig"].process()
+    return nodes["pig"].parameter_output_values["pig latin"]
+
+
+def timed(function, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    reruns = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    body = make_text(megabytes)
+    documents = {}
+
+    def document(introduction:str) -> str:
+        # Stands in for a document node: one string per distinct introduction, reused across runs
+        text = documents.get(introduction)
+        if text is None:
+            text = documents[introduction] = f"{introduction}\n{body}"
+        return text
+
+    print(f"flow: Age + CreateName -> CreateIntroduction -> ConvertToPigLatin on a {megabytes:g} MB document, {reruns} re-runs")
+    print("memoization  cold run ms  unchanged re-run ms (median)  age changed ms")
+    outputs = []
+    for enabled in (False, True):
+        memoization.configure(enabled=enabled)
+        memoization.reset_memo_stats()
+        nodes = build_flow()
+        cold, first = timed(run_flow, nodes, 36, document)
+        rerun = statistics.median(timed(run_flow, nodes, 36, document)[0] for _ in range(reruns))
+        changed, last = timed(run_flow, nodes, 37, document)
+        outputs.append((first, last))
+        print(f"{'on' if enabled else 'off':11s}  {cold * 1000:11.1f}  {rerun * 1000:28.3f}  {changed * 1000:14.1f}")
+    if outputs[0] != outputs[1]:
+        raise SystemExit("memoized flow produced different output")
+
+    print("hit rates with memoization on:")
+    for node_class, stats in memoization.memo_stats().items():
+        print(f"  {node_class:20s} {stats['hits']:4d} hits  {stats['misses']:3d} misses  {stats['hit_rate']:6.1%}")
+    memoization.configure()
+
+
+if __name__ == "__main__":
+    main()
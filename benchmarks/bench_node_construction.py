@@ -0,0 +1,144 @@
+"""Per-instance construction time and memory for every node in library.json.
+
+Each class is instantiated many times (10,000 by default), the way a large flow creates its nodes. Time is the
+median over a few rounds. Memory is what tracemalloc sees still allocated once the nodes exist, divided by the
+count, so it covers the node and its Parameters but not the specs every instance shares.
+
+For reference, Age and CreateName are also built the old way: __init__ assembling each Parameter from literals,
+with CreateName defining a new capitalize_name closure per instance. Most of the time goes into griptape_nodes'
+own Parameter and node constructors, so only figures measured on the real engine say anything about the difference.
+
+Run from the repository root:
+    python benchmarks/bench_node_construction.py [count] [rounds]
+"""
+import gc
+import statistics
+import sys
+import time
+import tracemalloc
+
+import library_path  # noqa: F401
+from griptape_nodes.exe_types.core_types import Parameter, ParameterMode
+from griptape_nodes.exe_types.node_types import DataNode
+from griptape_nodes.traits.clamp import Clamp
+from griptape_nodes.traits.minmax import MinMax
+
+from suite import load_node_classes
+
+
+class LegacyAge(DataNode):
+    # Age before its parameters were declared on the class, kept here as the reference.
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+
+        self.category = "DataNodes"
+        self.description = "Age Node"
+        self.add_parameter(
+            Parameter(
+                name="age",
+                input_types=["int","float"],
+                type="int",
+                output_type="int",
+                default_value= 30,
+                tooltip="What is your age",
+                allowed_modes={ParameterMode.PROPERTY, ParameterMode.OUTPUT},
+                traits={MinMax(min_val=1, max_val=98), Clamp(min_val=1, max_val=98)},
+                ui_options={"slider":{"min_val":1, "max_val":98}}
+            )
+        )
+
+
+class LegacyCreateName(DataNode):
+    # CreateName before its parameters were declared on the class, with the converter it used to define per instance.
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+
+        self.category = "DataNodes"
+        self.description = "An example node with dependencies"
+
+        def capitalize_name(value:str) -> str:
+            if not value:
+                return value
+            return value[0].upper() + value[1:]
+
+        self.add_parameter(
+            Parameter(
+                name="first name",
+                input_types=["str"],
+                type="str",
+                allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
+                output_type="str",
+                default_value = "Jane",
+                tooltip="The first name of the user",
+                converters=[capitalize_name]
+            )
+        )
+        self.add_parameter(
+            Parameter(
+                name="last name",
+                output_type="str",
+                type="str",
+                default_value="Smith",
+                tooltip="The last name of the user",
+                allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
+                converters=[capitalize_name]
+            )
+        )
+        self.add_parameter(
+            Parameter(
+                name="full name",
+                output_type="str",
+                tooltip="The full name of the user",
+                allowed_modes={ParameterMode.OUTPUT}
+            )
+        )
+
+
+def construct(node_class:type, count:int) -> list:
+    return [node_class(name=f"{node_class.__name__}_{index}") for index in range(count)]
+
+
+def per_instance_us(node_class:type, count:int, rounds:int) -> float:
+    times = []
+    for _ in range(rounds):
+        gc.collect()
+        start = time.perf_counter()
+        nodes = construct(node_class, count)
+        times.append(time.perf_counter() - start)
+        del nodes
+    return statistics.median(times) / count * 1_000_000
+
+
+def per_instance_bytes(node_class:type, count:int) -> float:
+    # One instance first, so class-level caches and lazily built state aren't charged to the count
+    construct(node_class, 1)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        nodes = construct(node_class, count)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del nodes
+    return (after - before) / count
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    classes = load_node_classes()
+    classes["Age (legacy __init__)"] = LegacyAge
+    classes["CreateName (legacy __init__)"] = LegacyCreateName
+
+    print(f"{count} instances per class, time is the median of {rounds} rounds")
+    print(f"{'node':32s} {'params':>6s} {'µs/node':>9s} {'bytes/node':>11s} {'total MB':>9s}")
+    for label, node_class in classes.items():
+        micros = per_instance_us(node_class, count, rounds)
+        size = per_instance_bytes(node_class, count)
+        params = len(getattr(node_class, "PARAMETERS", ())) or "-"
+        print(f"{label:32s} {params!s:>6s} {micros:9.1f} {size:11,.0f} {size * count / 1_000_000:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
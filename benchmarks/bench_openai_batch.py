@@ -0,0 +1,48 @@
+"""Throughput of OpenAIChatBatch versus running OpenAIChat once per prompt, against a slow local stand-in server.
+
+Run from the repository root:
+    python benchmarks/bench_openai_batch.py [prompts] [latency_seconds]
+"""
+import os
+import sys
+import time
+from unittest import mock
+
+import library_path  # noqa: F401
+from openai_chat import OpenAIChat, OpenAIChatBatch
+
+from fake_servers import FakeOpenAIServer
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    prompts = [f"Describe item {index}" for index in range(count)]
+    with FakeOpenAIServer(words=40, latency=latency) as server, mock.patch.dict(os.environ, {"OPENAI_BASE_URL": server.base_url}), \
+            mock.patch.object(OpenAIChat, "get_config_value", return_value="sk-bench"), \
+            mock.patch.object(OpenAIChatBatch, "get_config_value", return_value="sk-bench"):
+        node = OpenAIChat(name="serial")
+        node.parameter_values["flush interval"] = 1.0
+        start = time.perf_counter()
+        serial = []
+        for prompt in prompts:
+            node.parameter_values["prompt"] = prompt
+            node.process()
+            serial.append(node.parameter_output_values["output"])
+        serial_seconds = time.perf_counter() - start
+
+        print(f"{count} prompts, {latency * 1000:.0f} ms server latency")
+        print(f"one node run per prompt: {serial_seconds:6.2f}s  {count / serial_seconds:6.1f} prompts/s")
+        for workers in (4, 16, 32):
+            batch = OpenAIChatBatch(name="batch")
+            batch.parameter_values.update({"prompts": prompts, "max workers": workers})
+            start = time.perf_counter()
+            batch.process()
+            seconds = time.perf_counter() - start
+            if batch.parameter_output_values["outputs"] != serial:
+                raise SystemExit("batch outputs differ from serial outputs")
+            print(f"batch, {workers:2d} workers:       {seconds:6.2f}s  {count / seconds:6.1f} prompts/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Streaming metrics reported by OpenAIChat against a local stand-in OpenAI server with per-token delay.
+
+Prints the node's own time-to-first-token, tokens/sec and total latency outputs, and how many incremental updates
+reached the output parameter for a few flush intervals.
+
+Run from the repository root:
+    python benchmarks/bench_openai_streaming.py [words] [token_delay_seconds]
+"""
+import os
+import sys
+from unittest import mock
+
+import library_path  # noqa: F401
+from openai_chat import OpenAIChat
+
+from fake_servers import FakeOpenAIServer
+
+
+def main() -> None:
+    words = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    token_delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.002
+    with FakeOpenAIServer(words=words, token_delay=token_delay) as server, mock.patch.dict(os.environ, {"OPENAI_BASE_URL": server.base_url}), \
+            mock.patch.object(OpenAIChat, "get_config_value", return_value="sk-bench"):
+        print(f"{words} streamed tokens, {token_delay * 1000:.1f} ms apart")
+        print("flush s  updates  first token ms  tokens/s  total ms")
+        for flush_interval in (0.0, 0.05, 0.25):
+            node = OpenAIChat(name="bench")
+            node.parameter_values["flush interval"] = flush_interval
+            with mock.patch.object(node, "append_value_to_parameter", wraps=node.append_value_to_parameter) as append:
+                node.process()
+            outputs = node.parameter_output_values
+            print(
+                f"{flush_interval:7.2f}  {append.call_count:7d}  {outputs['time to first token'] * 1000:14.1f}"
+                f"  {outputs['tokens per second']:8.0f}  {outputs['total latency'] * 1000:8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
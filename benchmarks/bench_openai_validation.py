@@ -0,0 +1,49 @@
+"""API calls made by validate_node across a flow of OpenAIChat nodes, before and after per-key caching.
+
+"legacy" reproduces the old validate_node (a new client and a models.list() call per node). Runs against a local
+stand-in OpenAI-compatible server, so no API key or network access is needed.
+
+Run from the repository root:
+    python benchmarks/bench_openai_validation.py [nodes] [flow_runs]
+"""
+import os
+import sys
+import time
+from unittest import mock
+
+import openai
+
+import library_path  # noqa: F401
+import openai_client
+from openai_chat import OpenAIChat
+
+from fake_servers import FakeOpenAIServer
+
+API_KEY = "sk-bench"
+
+
+def legacy_validate(node:OpenAIChat) -> None:
+    openai.OpenAI(api_key=API_KEY).models.list()
+
+
+def main() -> None:
+    nodes_per_flow = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    flow_runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    with FakeOpenAIServer(latency=0.02) as server, mock.patch.dict(os.environ, {"OPENAI_BASE_URL": server.base_url}), \
+            mock.patch.object(OpenAIChat, "get_config_value", return_value=API_KEY):
+        nodes = [OpenAIChat(name=f"chat_{index}") for index in range(nodes_per_flow)]
+        print(f"{nodes_per_flow} OpenAIChat nodes, {flow_runs} flow runs, 20 ms server latency")
+        for label, validate in (("legacy", legacy_validate), ("cached", OpenAIChat.validate_node)):
+            openai_client.validation_cache.clear()
+            calls = server.counts["v1/models"]
+            start = time.perf_counter()
+            for _ in range(flow_runs):
+                for node in nodes:
+                    if validate(node):
+                        raise SystemExit("validation failed")
+            seconds = time.perf_counter() - start
+            print(f"{label:7s} {server.counts['v1/models'] - calls:5d} models.list calls  {seconds:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Throughput of to_pig_latin on multi-megabyte inputs, compared against the original per-word regex implementation.
+
+Text is drawn from a large synthetic vocabulary with Zipf-distributed word frequencies, like natural text: a few
+words repeat constantly and most are rare. to_pig_latin is timed twice, first with its word cache cleared and then
+again with the cache left warm from that run. A run with the cache bypassed shows what the precompiled patterns
+alone are worth.
+
+Run from the repository root:
+    python benchmarks/bench_pig_latin.py [megabytes]
+"""
+import itertools
+import random
+import re
+import sys
+import time
+from functools import lru_cache
+
+import library_path  # noqa: F401
+from pig_latin_engine import WORD_CACHE_SIZE, _translate_word, to_pig_latin, to_pig_latin_many
+
+# Edge cases for the translator: punctuation, quotes, hyphens, numbers and vowel-less words. They take the most
+# frequent ranks of the vocabulary so every text contains them.
+WORDS = (
+    "The quick brown fox, jumped over 'the' lazy dog! Rhythm: my xyz. Apple? "
+    "Strength... Once upon a time there was a \"little\" school-house in 1969."
+).split()
+
+ONSETS = ["", "b", "bl", "br", "c", "ch", "cr", "d", "dr", "f", "fl", "g", "gr", "h", "j", "k", "l", "m", "n", "p",
+          "pl", "pr", "qu", "r", "s", "sh", "sl", "sp", "st", "str", "t", "th", "tr", "v", "w", "wh", "y", "z"]
+NUCLEI = ["a", "e", "i", "o", "u", "ai", "ea", "ee", "ie", "oo", "ou", "y"]
+CODAS = ["", "", "", "n", "r", "s", "t", "ck", "ld", "nd", "ng", "nt", "rd", "rt", "st", "th", "x"]
+PUNCTUATION = [",", ".", ";", ":", "!", "?", "'s", "..."]
+
+VOCABULARY_SIZE = 100_000
+ZIPF_EXPONENT = 1.0
+
+
+@lru_cache(maxsize=None)
+def vocabulary(size:int=VOCABULARY_SIZE, seed:int=0) -> tuple[tuple[str, ...], tuple[float, ...]]:
+    # Distinct words of one to four syllables, and cumulative Zipf weights for sampling them by rank.
+    rng = random.Random(seed)
+    words = dict.fromkeys(WORDS)
+    while len(words) < size:
+        syllables = rng.choices([1, 2, 3, 4], weights=[30, 40, 20, 10])[0]
+        words.setdefault("".join(rng.choice(ONSETS) + rng.choice(NUCLEI) + rng.choice(CODAS) for _ in range(syllables)))
+    weights = [1 / rank ** ZIPF_EXPONENT for rank in range(1, size + 1)]
+    return tuple(words)[:size], tuple(itertools.accumulate(weights))
+
+
+def make_text(megabytes:float, seed:int=0) -> str:
+    rng = random.Random(seed)
+    words, cumulative = vocabulary()
+    text = []
+    size = 0
+    while size < megabytes * 1_000_000:
+        for word in rng.choices(words, cum_weights=cumulative, k=4096):
+            # Some tokens are capitalized or carry punctuation, which makes them distinct cache entries
+            roll = rng.random()
+            if roll < 0.05:
+                word = word.capitalize()
+            elif roll < 0.12:
+                word += rng.choice(PUNCTUATION)
+            text.append(word)
+            size += len(word) + 1
+            if size >= megabytes * 1_000_000:
+                break
+    return ' '.join(text)
+
+
+def legacy_to_pig_latin(text:str) -> str:
+    # The implementation before the compiled engine, kept here as the reference for output and speed.
+    if not text:
+        return ""
+    pig_latin_words = []
+    for word in text.split():
+        if not re.search('[a-zA-Z]', word):
+            pig_latin_words.append(word)
+            continue
+        leading_punct = re.match(r'^([^a-zA-Z]*)', word).group(0)
+        trailing_punct = re.search(r'([^a-zA-Z]*)$', word).group(0)
+        actual_word = word[len(leading_punct):len(word)-len(trailing_punct)]
+        if actual_word[0].lower() in 'aeiou':
+            pig_latin_word = actual_word + 'way'
+        else:
+            vowel_match = re.search('[aeiou]', actual_word.lower())
+            if not vowel_match:
+                pig_latin_word = actual_word + 'ay'
+            else:
+                index = vowel_match.start()
+                pig_latin_word = actual_word[index:] + actual_word[:index] + 'ay'
+        if actual_word[0].isupper():
+            pig_latin_word = pig_latin_word[0].upper() + pig_latin_word[1:].lower()
+        pig_latin_words.append(leading_punct + pig_latin_word + trailing_punct)
+    return ' '.join(pig_latin_words)
+
+
+def uncached_to_pig_latin(text:str) -> str:
+    # to_pig_latin with the word cache bypassed, so only the precompiled patterns are measured
+    return ' '.join(map(_translate_word.__wrapped__, text.split()))
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 4.0
+    text = make_text(megabytes)
+    tokens = text.split()
+
+    expected, legacy_seconds = timed(legacy_to_pig_latin, text)
+    _translate_word.cache_clear()
+    result, cold_seconds = timed(to_pig_latin, text)
+    cold = _translate_word.cache_info()
+    if result != expected:
+        raise SystemExit("to_pig_latin output differs from the legacy implementation")
+    _, warm_seconds = timed(to_pig_latin, text)
+    _, uncached_seconds = timed(uncached_to_pig_latin, text)
+
+    documents = [make_text(0.05, seed) for seed in range(40)]
+    batch, batch_seconds = timed(to_pig_latin_many, documents)
+    if batch != [legacy_to_pig_latin(document) for document in documents]:
+        raise SystemExit("to_pig_latin_many output differs from the legacy implementation")
+
+    print(f"input: {len(text) / 1_000_000:.1f} MB, {len(tokens):,} words, {len(set(tokens)):,} distinct (word cache holds {WORD_CACHE_SIZE:,})")
+    print(f"legacy:             {legacy_seconds:.3f}s  {megabytes / legacy_seconds:8.1f} MB/s")
+    print(f"no word cache:      {uncached_seconds:.3f}s  {megabytes / uncached_seconds:8.1f} MB/s  ({legacy_seconds / uncached_seconds:.1f}x)")
+    print(f"to_pig_latin cold:  {cold_seconds:.3f}s  {megabytes / cold_seconds:8.1f} MB/s  ({legacy_seconds / cold_seconds:.1f}x)  cache hit rate {cold.hits / (cold.hits + cold.misses):.1%}")
+    print(f"to_pig_latin warm:  {warm_seconds:.3f}s  {megabytes / warm_seconds:8.1f} MB/s  ({legacy_seconds / warm_seconds:.1f}x)")
+    print(f"to_pig_latin_many: {len(documents)} docs in {batch_seconds:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
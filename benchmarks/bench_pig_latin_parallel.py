@@ -0,0 +1,42 @@
+"""Scaling curve of parallel pig latin from 1 to N worker processes.
+
+Run from the repository root:
+    python benchmarks/bench_pig_latin_parallel.py [documents] [max_workers]
+"""
+import os
+import sys
+import time
+
+import library_path  # noqa: F401
+from pig_latin_engine import to_pig_latin, to_pig_latin_many, to_pig_latin_parallel, to_pig_latin_sharded
+
+from bench_pig_latin import make_text
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    documents = [make_text(0.05, seed) for seed in range(count)]
+    large = ' '.join(documents)
+    expected = to_pig_latin_many(documents)
+    expected_large = to_pig_latin(large)
+
+    print(f"{count} documents, {len(large) / 1_000_000:.1f} MB total")
+    print("workers  batch (s)  speedup  one document (s)  speedup")
+    baseline = baseline_large = None
+    for workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        result = to_pig_latin_parallel(documents, workers=workers, chunksize=16)
+        seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        result_large = to_pig_latin_sharded(large, workers=workers)
+        large_seconds = time.perf_counter() - start
+        if result != expected or result_large != expected_large:
+            raise SystemExit(f"parallel output differs from to_pig_latin with {workers} workers")
+        baseline = baseline or seconds
+        baseline_large = baseline_large or large_seconds
+        print(f"{workers:7d}  {seconds:9.3f}  {baseline / seconds:6.2f}x  {large_seconds:15.3f}  {baseline_large / large_seconds:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Peak memory of file-in/file-out pig latin versus reading the whole document into memory.
+
+Run from the repository root:
+    python benchmarks/bench_pig_latin_streaming.py [megabytes]
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import library_path  # noqa: F401
+from pig_latin_engine import pig_latin_file, to_pig_latin
+
+from bench_pig_latin import make_text
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def in_memory(input_path:Path, output_path:Path) -> None:
+    output_path.write_text(to_pig_latin(input_path.read_text(encoding="utf-8")), encoding="utf-8")
+
+
+def main() -> None:
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 20.0
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = Path(directory) / "input.txt"
+        input_path.write_text(make_text(megabytes), encoding="utf-8")
+
+        whole_seconds, whole_peak = measure(in_memory, input_path, Path(directory) / "whole.txt")
+        stream_seconds, stream_peak = measure(pig_latin_file, input_path, Path(directory) / "streamed.txt")
+        if (Path(directory) / "whole.txt").read_bytes() != (Path(directory) / "streamed.txt").read_bytes():
+            raise SystemExit("streamed output differs from to_pig_latin")
+
+    print(f"input: {megabytes:.0f} MB")
+    print(f"in memory: {whole_seconds:.2f}s  peak {whole_peak / 1_000_000:8.1f} MB")
+    print(f"streamed:  {stream_seconds:.2f}s  peak {stream_peak / 1_000_000:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Repeated OpenAIChat prompts with and without the on-disk response cache.
+
+Sends a small set of prompts several times through the node against a local stand-in OpenAI server and reports
+API calls, wall time and the cache's hit/miss counters.
+
+Run from the repository root:
+    python benchmarks/bench_response_cache.py [prompts] [repeats]
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+import library_path  # noqa: F401
+import openai_chat
+from openai_chat import OpenAIChat
+from response_cache import ResponseCache
+
+from fake_servers import FakeOpenAIServer
+
+
+def main() -> None:
+    prompts = [f"Summarise chapter {index}" for index in range(int(sys.argv[1]) if len(sys.argv) > 1 else 10)]
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    with FakeOpenAIServer(words=100, token_delay=0.001, latency=0.05) as server, tempfile.TemporaryDirectory() as directory, \
+            mock.patch.dict(os.environ, {"OPENAI_BASE_URL": server.base_url}), \
+            mock.patch.object(OpenAIChat, "get_config_value", return_value="sk-bench"):
+        cache = ResponseCache(Path(directory) / "responses.sqlite3")
+        print(f"{len(prompts)} prompts x {repeats} repeats, 50 ms latency + 100 tokens at 1 ms")
+        for use_cache in (False, True):
+            node = OpenAIChat(name="bench")
+            node.parameter_values["use cache"] = use_cache
+            calls = server.counts["v1/chat/completions"]
+            with mock.patch.object(openai_chat, "get_response_cache", lambda: cache):
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    for prompt in prompts:
+                        node.parameter_values["prompt"] = prompt
+                        node.process()
+                seconds = time.perf_counter() - start
+            label = "cached" if use_cache else "uncached"
+            print(f"{label:8s}  {server.counts['v1/chat/completions'] - calls:4d} API calls  {seconds:6.2f}s  {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Search request count for repeated and paginated NasaImageSearchNode queries, with and without the search cache.
+
+Run from the repository root:
+    python benchmarks/bench_search_cache.py [runs]
+"""
+import sys
+import time
+from unittest import mock
+
+import library_path  # noqa: F401
+import nasa_image_search
+from nasa_image_search import NasaImageSearchNode
+from ttl_cache import TTLCache
+
+from fake_servers import FakeNasaServer
+
+
+def run(server:FakeNasaServer, indexes:list[int], use_cache:bool) -> tuple[float, int]:
+    node = NasaImageSearchNode(name="bench")
+    node.parameter_values["use_cache"] = use_cache
+    searches = server.counts["search"]
+    cache = TTLCache(ttl=3600)
+    with mock.patch.object(nasa_image_search, "get_search_cache", lambda: cache):
+        start = time.perf_counter()
+        for index in indexes:
+            node.parameter_values["result_index"] = index
+            node.process()
+            if node.parameter_output_values["error_message"]:
+                raise SystemExit(node.parameter_output_values["error_message"])
+        seconds = time.perf_counter() - start
+    return seconds, server.counts["search"] - searches
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    workloads = {
+        "repeated": [0] * runs,
+        "paginated": list(range(runs)),
+    }
+    with FakeNasaServer(total_items=max(runs, 100), latency=0.01) as server, mock.patch.object(nasa_image_search, "NASA_API_URL", f"{server.url}/search"):
+        print(f"{runs} runs per workload, 10 ms server latency, page size {nasa_image_search.SEARCH_PAGE_SIZE}")
+        for name, indexes in workloads.items():
+            for use_cache in (False, True):
+                seconds, searches = run(server, indexes, use_cache)
+                label = "cached" if use_cache else "uncached"
+                print(f"{name:9s} {label:8s}  {seconds:6.2f}s  {searches:4d} search requests")
+
+
+if __name__ == "__main__":
+    main()
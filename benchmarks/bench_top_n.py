@@ -0,0 +1,43 @@
+"""Wall time of fetching the top N NASA results concurrently versus one download at a time.
+
+Run from the repository root:
+    python benchmarks/bench_top_n.py [count] [latency_seconds]
+"""
+import sys
+import time
+from unittest import mock
+
+import library_path  # noqa: F401
+import nasa_image_search
+from nasa_image_search import NasaImageSearchNode
+
+from fake_servers import FakeNasaServer
+
+
+def run(count:int, workers:int) -> float:
+    node = NasaImageSearchNode(name="bench")
+    node.parameter_values["result_count"] = count
+    # Caching off so every run really downloads
+    node.parameter_values["use_cache"] = False
+    with mock.patch.object(nasa_image_search, "MAX_DOWNLOAD_WORKERS", workers):
+        start = time.perf_counter()
+        node.process()
+        seconds = time.perf_counter() - start
+    if node.parameter_output_values["error_message"]:
+        raise SystemExit(node.parameter_output_values["error_message"])
+    return seconds
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    with FakeNasaServer(latency=latency) as server, mock.patch.object(nasa_image_search, "NASA_API_URL", f"{server.url}/search"):
+        serial = run(count, 1)
+        concurrent = run(count, nasa_image_search.MAX_DOWNLOAD_WORKERS)
+    print(f"top {count} results, {latency * 1000:.0f} ms per request")
+    print(f"one at a time: {serial:.2f}s")
+    print(f"concurrent:    {concurrent:.2f}s  ({nasa_image_search.MAX_DOWNLOAD_WORKERS} workers, {serial / concurrent:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Artifact size and processing time of NasaImageSearchNode with and without the downscale/transcode stage.
+
+Serves a large JPEG from a local stand-in NASA server and runs the node with several output settings, first cold
+(download + transcode) and then warm (served from the per-settings cache).
+
+Run from the repository root:
+    python benchmarks/bench_transcode.py [width] [height]
+"""
+import sys
+import tempfile
+import time
+from io import BytesIO
+from unittest import mock
+
+from PIL import Image, ImageDraw
+
+import library_path  # noqa: F401
+import nasa_image_search
+from image_cache import ImageCache
+from nasa_image_search import NasaImageSearchNode
+
+from fake_servers import FakeNasaServer
+
+SETTINGS = (
+    ("original", 0, "original"),
+    ("jpeg 2048", 2048, "jpeg"),
+    ("webp 1024", 1024, "webp"),
+    ("webp 512", 512, "webp"),
+)
+
+
+def make_jpeg(width:int, height:int) -> bytes:
+    image = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    for offset in range(0, width, 40):
+        draw.line((offset, 0, width - offset, height), fill=(200, 80, 40), width=3)
+    output = BytesIO()
+    image.save(output, format="JPEG", quality=92)
+    return output.getvalue()
+
+
+def run_once(node:NasaImageSearchNode) -> tuple[float, int]:
+    start = time.perf_counter()
+    node.process()
+    seconds = time.perf_counter() - start
+    if node.parameter_output_values["error_message"]:
+        raise SystemExit(node.parameter_output_values["error_message"])
+    return seconds, len(node.parameter_output_values["image"].value)
+
+
+def main() -> None:
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 6000
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else 4000
+    image = make_jpeg(width, height)
+    with FakeNasaServer(image=image, content_type="image/jpeg") as server, tempfile.TemporaryDirectory() as directory:
+        cache = ImageCache(directory, max_age=3600)
+        with mock.patch.object(nasa_image_search, "NASA_API_URL", f"{server.url}/search"), mock.patch.object(nasa_image_search, "get_image_cache", lambda: cache):
+            print(f"source: {width}x{height} JPEG, {len(image) / 1024:.0f} KB")
+            print("settings     artifact KB   cold ms   warm ms")
+            for label, max_dimension, output_format in SETTINGS:
+                cache.clear()
+                node = NasaImageSearchNode(name="bench")
+                node.parameter_values.update(max_dimension=max_dimension, output_format=output_format, quality=80)
+                cold, size = run_once(node)
+                warm, _ = run_once(node)
+                print(f"{label:11s}  {size / 1024:11.0f}  {cold * 1000:8.1f}  {warm * 1000:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""Local stand-in HTTP servers used by the benchmarks.
+
+FakeNasaServer imitates the images-api.nasa.gov search endpoint and serves generated PNG previews.
+FakeOpenAIServer imitates the OpenAI models and chat completions endpoints, including streamed responses.
+Both count connections and requests so benchmarks can show what pooling and caching save, and either can be told
+to fail the next requests with fail_next(), for tests of retries and error handling.
+"""
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def make_png(width:int, height:int, noise:bool=False) -> bytes:
+    # A valid greyscale PNG built without Pillow, so the fake server has no extra dependencies.
+    # Noise makes the pixel data incompressible, for benchmarks that need genuinely large files.
+    def chunk(kind:bytes, data:bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    if noise:
+        pixels = b"".join(b"\x00" + os.urandom(width) for _ in range(height))
+    else:
+        pixels = (b"\x00" + b"\x80" * width) * height
+    header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(pixels, 1)) + chunk(b"IEND", b"")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Buffer headers and body into one write. Separate small writes on a keep-alive connection
+    # hit delayed-ACK stalls of ~40ms that would swamp the numbers being measured.
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def handle(self) -> None:
+        self.server.owner.count("connections")
+        super().handle()
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self.dispatch(None)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        self.dispatch(json.loads(self.rfile.read(length) or b"null"))
+
+    def dispatch(self, body:object) -> None:
+        owner = self.server.owner
+        if owner.latency:
+            time.sleep(owner.latency)
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        # Routes match the full path, or else its first segment, e.g. "/v1/models" or "/images"
+        route = url.path if url.path in owner.routes else "/" + url.path.split("/")[1]
+        handler = owner.routes.get(route)
+        if handler is None:
+            self.send_body(404, b"not found", "text/plain")
+            return
+        owner.count(route.lstrip("/"))
+        failure = owner.next_failure()
+        if failure is not None:
+            status, headers = failure
+            self.send_body(status, json.dumps({"error": {"message": f"injected {status}", "type": "server_error"}}).encode(), "application/json", headers)
+            return
+        if body is None:
+            handler(self, url.path, query)
+        else:
+            handler(self, url.path, query, body)
+
+    def send_body(self, status:int, body:bytes, content_type:str, headers:dict | None=None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_stream(self, events) -> None:
+        # Server-sent events over chunked encoding, flushed one event at a time
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for event in events:
+            data = f"data: {event}\n\n".encode()
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    owner: "FakeServer"
+
+
+class FakeServer:
+    """Runs a ThreadingHTTPServer on a free localhost port for the duration of a with-block."""
+
+    def __init__(self, latency:float=0.0) -> None:
+        self.latency = latency
+        self.counts: Counter = Counter()
+        self.routes: dict = {}
+        self._failures: list[tuple[int, dict]] = []
+        self._lock = threading.Lock()
+        self._server: _Server | None = None
+
+    def count(self, key:str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+
+    def fail_next(self, status:int, times:int=1, headers:dict | None=None) -> None:
+        # The next `times` requests to any route get this status (and headers) instead of their normal response
+        with self._lock:
+            self._failures.extend([(status, headers or {})] * times)
+
+    def next_failure(self) -> tuple[int, dict] | None:
+        with self._lock:
+            return self._failures.pop(0) if self._failures else None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeServer":
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.owner = self
+        # A short poll interval so leaving the with-block doesn't wait half a second for the server to notice
+        threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class FakeNasaServer(FakeServer):
+    """GET /search returns canned collection items; GET /images/<n>.png returns a generated preview."""
+
+    def __init__(self, total_items:int=100, image_size:tuple[int, int]=(640, 480), latency:float=0.0, noise:bool=False, image:bytes | None=None, content_type:str="image/png") -> None:
+        super().__init__(latency=latency)
+        self.total_items = total_items
+        # Pass image (with its content_type) to serve specific bytes instead of a generated PNG
+        self.image = image if image is not None else make_png(*image_size, noise=noise)
+        self.content_type = content_type
+        self.image_etag = f'"{zlib.crc32(self.image):08x}"'
+        self.routes = {"/search": self.search, "/images": self.image_file}
+
+    def item(self, index:int, query:str) -> dict:
+        return {
+            "data": [{"title": f"{query} #{index}", "description": f"Result {index} for {query}", "nasa_id": f"id-{index}"}],
+            "links": [{"href": f"{self.url}/images/{index}.png", "rel": "preview", "render": "image"}],
+        }
+
+    def search(self, handler:_Handler, path:str, query:dict) -> None:
+        page = int(query.get("page", 1))
+        page_size = int(query.get("page_size", 100))
+        start = (page - 1) * page_size
+        indexes = range(start, min(start + page_size, self.total_items))
+        body = {"collection": {"items": [self.item(index, query.get("q", "")) for index in indexes], "metadata": {"total_hits": self.total_items}}}
+        handler.send_body(200, json.dumps(body).encode(), "application/json")
+
+    def image_file(self, handler:_Handler, path:str, query:dict) -> None:
+        if handler.headers.get("If-None-Match") == self.image_etag:
+            self.count("not_modified")
+            handler.send_body(304, b"", self.content_type, {"ETag": self.image_etag})
+            return
+        handler.send_body(200, self.image, self.content_type, {"ETag": self.image_etag})
+
+
+class FakeOpenAIServer(FakeServer):
+    """GET /v1/models and POST /v1/chat/completions, streamed or not.
+
+    Replies are `words` words long and, when streamed, sent one word per chunk `token_delay` seconds apart.
+    Requests with the API key "invalid" are rejected with 401, like a revoked key.
+    """
+
+    def __init__(self, words:int=50, token_delay:float=0.0, latency:float=0.0) -> None:
+        super().__init__(latency=latency)
+        self.words = words
+        self.token_delay = token_delay
+        self.routes = {"/v1/models": self.models, "/v1/chat/completions": self.chat_completions}
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.url}/v1"
+
+    def authorized(self, handler:_Handler) -> bool:
+        if handler.headers.get("Authorization") == "Bearer invalid":
+            error = {"error": {"message": "Incorrect API key provided.", "type": "invalid_request_error", "code": "invalid_api_key"}}
+            handler.send_body(401, json.dumps(error).encode(), "application/json")
+            return False
+        return True
+
+    def models(self, handler:_Handler, path:str, query:dict) -> None:
+        if self.authorized(handler):
+            body = {"object": "list", "data": [{"id": "gpt-4o", "object": "model", "created": 0, "owned_by": "fake"}]}
+            handler.send_body(200, json.dumps(body).encode(), "application/json")
+
+    def reply(self, request:dict) -> list[str]:
+        prompt = str(request["messages"][-1].get("content", "")) if request.get("messages") else ""
+        seed = zlib.crc32(prompt.encode())
+        return [f"word{(seed + index) % 997}" for index in range(self.words)]
+
+    def chat_completions(self, handler:_Handler, path:str, query:dict, request:dict) -> None:
+        if not self.authorized(handler):
+            return
+        words = self.reply(request)
+        model = request.get("model", "gpt-4o")
+        usage = {"prompt_tokens": 10, "completion_tokens": len(words), "total_tokens": 10 + len(words)}
+        if not request.get("stream"):
+            time.sleep(self.token_delay * len(words))
+            body = {
+                "id": "chatcmpl-fake", "object": "chat.completion", "created": 0, "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": " ".join(words)}}],
+                "usage": usage,
+            }
+            handler.send_body(200, json.dumps(body).encode(), "application/json")
+            return
+
+        def events():
+            for index, word in enumerate(words):
+                time.sleep(self.token_delay)
+                delta = {"role": "assistant", "content": word if index == 0 else " " + word}
+                yield json.dumps({"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": 0, "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+            yield json.dumps({"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": 0, "model": model, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+            yield json.dumps({"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": 0, "model": model, "choices": [], "usage": usage})
+            yield "[DONE]"
+
+        handler.send_stream(events())
@@ -0,0 +1,12 @@
+"""Puts the node library directory on sys.path, the way the engine does when it registers library.json.
+
+Node modules import their helpers as siblings (e.g. `from http_session import get_session`), so benchmarks import
+them the same way: `import library_path` first, then `import nasa_image_search`.
+"""
+import sys
+from pathlib import Path
+
+LIBRARY_DIR = Path(__file__).resolve().parent.parent / "kyro_nodes_dev"
+
+if str(LIBRARY_DIR) not in sys.path:
+    sys.path.insert(0, str(LIBRARY_DIR))
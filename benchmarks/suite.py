@@ -0,0 +1,346 @@
+"""Benchmark suite covering every node class listed in library.json.
+
+Each workload builds a node the way the engine would, sets its parameter values and times process() over a number of
+iterations. NASA and OpenAI nodes run against the local stand-in servers in fake_servers.py, with the image and
+search caches pointed at a temporary directory. For every workload the suite reports latency percentiles, throughput
+and the peak Python heap of one extra traced run (tracemalloc, so memory held by C libraries such as Pillow's pixel
+buffers is not included).
+
+Results are compared against a JSON baseline and the suite exits non-zero when a workload's median latency or peak
+memory regresses past the tolerance. Baselines are machine-specific, so none is checked in: record one first, on
+the machine and griptape_nodes install you'll compare on (a CI runner, say), before the changes you want to check.
+Each baseline records the griptape_nodes version, Python version, machine and CPU count it was measured with, and
+the suite won't compare a run against a baseline recorded on a different setup.
+
+Run from the repository root:
+    python benchmarks/suite.py --update           # first: record benchmarks/baselines/suite.json
+    python benchmarks/suite.py                    # then: compare against it
+    python benchmarks/suite.py --filter nasa --output results.json
+"""
+import argparse
+import gc
+import importlib
+import importlib.metadata
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+from unittest import mock
+
+import library_path
+import memoization
+
+from bench_columnar import make_columns
+from bench_pig_latin import make_text
+from fake_servers import FakeNasaServer, FakeOpenAIServer
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "suite.json"
+
+# A workload regresses when it is this much slower or bigger than the baseline, and by at least the absolute floor,
+# so microsecond-scale workloads don't trip on scheduler noise.
+LATENCY_TOLERANCE = 0.25
+MEMORY_TOLERANCE = 0.10
+LATENCY_FLOOR_MS = 0.05
+MEMORY_FLOOR_MB = 0.5
+
+# Recorded in place of a version when griptape_nodes is importable but not installed as a package
+UNPACKAGED_ENGINE = "unpackaged stand-in"
+
+
+@dataclass
+class Workload:
+    name: str
+    # A class_name from library.json, or None for a plain function workload
+    node_class: str | None
+    iterations: int
+    # Called before every iteration with the node (or None) and the iteration number
+    prepare: Callable[[Any, int], None] = lambda node, iteration: None
+    # Function workloads call this instead of node.process()
+    run: Callable[[], Any] | None = None
+    # Input size per iteration, for MB/s
+    input_bytes: int = 0
+    warmup: int = 1
+    # Checked after the last run, e.g. that the node produced output and no error
+    check: Callable[[Any], str | None] = lambda node: None
+
+
+@dataclass
+class Result:
+    name: str
+    iterations: int
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    mean_ms: float
+    ops_per_second: float
+    mb_per_second: float | None
+    peak_mb: float
+    regressions: list[str] = field(default_factory=list)
+
+
+def load_node_classes() -> dict[str, type]:
+    # Imports node files the way benchmarks do elsewhere, as siblings on sys.path
+    library = json.loads((library_path.LIBRARY_DIR / "library.json").read_text())
+    classes = {}
+    for node in library["nodes"]:
+        module = importlib.import_module(Path(node["file_path"]).stem)
+        classes[node["class_name"]] = getattr(module, node["class_name"])
+    return classes
+
+
+def percentile(sorted_values:list[float], fraction:float) -> float:
+    # Nearest-rank percentile; good enough for a few hundred samples
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def engine_version() -> str:
+    try:
+        return importlib.metadata.version("griptape-nodes")
+    except importlib.metadata.PackageNotFoundError:
+        return UNPACKAGED_ENGINE
+
+
+def run_setup(scale:float) -> dict[str, Any]:
+    return {
+        "griptape_nodes": engine_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "scale": scale,
+    }
+
+
+def setup_differences(setup:dict[str, Any], baseline_setup:dict[str, Any]) -> list[str]:
+    # Timings only compare between runs on the same engine, interpreter and hardware; patch releases and kernels may differ
+    differences = []
+    for key in ("griptape_nodes", "machine", "cpus"):
+        if setup.get(key) != baseline_setup.get(key):
+            differences.append(f"{key} {setup.get(key)} vs baseline {baseline_setup.get(key)}")
+    python, baseline_python = setup["python"].rsplit(".", 1)[0], str(baseline_setup.get("python")).rsplit(".", 1)[0]
+    if python != baseline_python:
+        differences.append(f"python {setup['python']} vs baseline {baseline_setup.get('python')}")
+    return differences
+
+
+def set_values(**values) -> Callable[[Any, int], None]:
+    def prepare(node, iteration:int) -> None:
+        node.parameter_values.update(values)
+    return prepare
+
+
+def no_error(parameter:str, error_parameter:str | None=None) -> Callable[[Any], str | None]:
+    def check(node) -> str | None:
+        if error_parameter and node.parameter_output_values.get(error_parameter):
+            return str(node.parameter_output_values[error_parameter])
+        if not node.parameter_output_values.get(parameter):
+            return f"no {parameter!r} output"
+        return None
+    return check
+
+
+def workloads(scale:float) -> list[Workload]:
+    from pig_latin_engine import to_pig_latin
+
+    def count(n:int) -> int:
+        return max(1, int(n * scale))
+
+    small_text = make_text(0.0002, seed=1)
+    huge_text = make_text(8, seed=2)
+    documents = [make_text(0.05, seed=seed) for seed in range(64)]
+    prompts = [f"Summarize mission report {index}" for index in range(16)]
+    first_names, last_names, ages = make_columns(100_000)
+    full_names = [f"{first} {last}" for first, last in zip(first_names, last_names)]
+
+    def paginated(node, iteration:int) -> None:
+        # Walks result windows across page boundaries with caching off, so every run fetches real pages
+        node.parameter_values.update(query="apollo", result_index=(iteration * 7) % 90, result_count=4, use_cache=False)
+
+    def streamed(node, iteration:int) -> None:
+        node.parameter_values.update({"prompt": f"Tell me about launch {iteration}", "flush interval": 0.05})
+
+    return [
+        Workload("to_pig_latin small text", None, count(5000), run=lambda: to_pig_latin(small_text), input_bytes=len(small_text)),
+        Workload("to_pig_latin huge text", None, count(10), run=lambda: to_pig_latin(huge_text), input_bytes=len(huge_text)),
+        Workload("ConvertToPigLatin small text", "ConvertToPigLatin", count(5000), set_values(input=small_text), input_bytes=len(small_text), check=no_error("pig latin")),
+        Workload("ConvertToPigLatin huge text", "ConvertToPigLatin", count(10), set_values(input=huge_text), input_bytes=len(huge_text), check=no_error("pig latin")),
+        Workload(
+            "ConvertToPigLatinBatch 64 documents", "ConvertToPigLatinBatch", count(5),
+            set_values(inputs=documents, workers=2), input_bytes=sum(map(len, documents)), check=no_error("pig latin"),
+        ),
+        Workload("CreateName", "CreateName", count(20000), set_values(**{"first name": "ada", "last name": "lovelace"}), check=no_error("full name")),
+        Workload("CreateIntroduction", "CreateIntroduction", count(20000), set_values(**{"full name": "Ada Lovelace", "age": 36}), check=no_error("introduction")),
+        Workload("Age", "Age", count(20000), set_values(age=36), check=no_error("age")),
+        Workload(
+            "CreateNameBatch 100k rows", "CreateNameBatch", count(20),
+            set_values(**{"first names": first_names, "last names": last_names}), check=no_error("full names"),
+        ),
+        Workload(
+            "CreateIntroductionBatch 100k rows", "CreateIntroductionBatch", count(20),
+            set_values(**{"full names": full_names, "ages": ages}), check=no_error("introductions"),
+        ),
+        Workload(
+            "NasaImageSearchNode repeated query", "NasaImageSearchNode", count(50),
+            set_values(query="apollo", result_index=0, result_count=1, use_cache=True), check=no_error("image", "error_message"),
+        ),
+        Workload("NasaImageSearchNode paginated", "NasaImageSearchNode", count(30), paginated, check=no_error("images", "error_message")),
+        Workload("OpenAIChat streamed", "OpenAIChat", count(20), streamed, check=no_error("output")),
+        Workload("OpenAIChatBatch 16 prompts", "OpenAIChatBatch", count(10), set_values(prompts=prompts, **{"max workers": 8}), check=no_error("outputs")),
+    ]
+
+
+def measure(workload:Workload, classes:dict[str, type]) -> Result:
+    node = classes[workload.node_class](name="bench") if workload.node_class else None
+
+    def once(iteration:int) -> float:
+        if node is not None:
+            workload.prepare(node, iteration)
+        start = time.perf_counter()
+        if workload.run is not None:
+            workload.run()
+        else:
+            node.process()
+        return time.perf_counter() - start
+
+    for iteration in range(workload.warmup):
+        once(iteration)
+    gc.collect()
+    latencies = [once(iteration) for iteration in range(workload.warmup, workload.warmup + workload.iterations)]
+    if node is not None:
+        error = workload.check(node)
+        if error:
+            raise SystemExit(f"{workload.name}: {error}")
+
+    # Peak memory comes from a separate traced run, so tracing overhead doesn't skew the timings above
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline_bytes = tracemalloc.get_traced_memory()[0]
+        once(workload.warmup + workload.iterations)
+        peak_bytes = tracemalloc.get_traced_memory()[1] - baseline_bytes
+    finally:
+        tracemalloc.stop()
+
+    total = sum(latencies)
+    ordered = sorted(latencies)
+    return Result(
+        name=workload.name,
+        iterations=len(latencies),
+        p50_ms=percentile(ordered, 0.50) * 1000,
+        p90_ms=percentile(ordered, 0.90) * 1000,
+        p99_ms=percentile(ordered, 0.99) * 1000,
+        mean_ms=statistics.fmean(latencies) * 1000,
+        ops_per_second=len(latencies) / total,
+        mb_per_second=workload.input_bytes * len(latencies) / total / 1_000_000 if workload.input_bytes else None,
+        peak_mb=max(0, peak_bytes) / 1_000_000,
+    )
+
+
+def compare(result:Result, baseline:dict | None, latency_tolerance:float, memory_tolerance:float) -> None:
+    if baseline is None:
+        return
+    if result.p50_ms > baseline["p50_ms"] * (1 + latency_tolerance) and result.p50_ms - baseline["p50_ms"] > LATENCY_FLOOR_MS:
+        result.regressions.append(f"p50 {result.p50_ms:.3f} ms vs baseline {baseline['p50_ms']:.3f} ms")
+    if result.peak_mb > baseline["peak_mb"] * (1 + memory_tolerance) and result.peak_mb - baseline["peak_mb"] > MEMORY_FLOOR_MB:
+        result.regressions.append(f"peak {result.peak_mb:.1f} MB vs baseline {baseline['peak_mb']:.1f} MB")
+
+
+def environment(stack:ExitStack, classes:dict[str, type]) -> None:
+    # Everything external is local: fake servers, throwaway caches, and a dummy API key
+    cache_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix="kyro-bench-"))
+    stack.enter_context(mock.patch.dict(os.environ, {"KYRO_NODES_CACHE_DIR": cache_dir}))
+    nasa = stack.enter_context(FakeNasaServer(total_items=200))
+    openai = stack.enter_context(FakeOpenAIServer(words=200, token_delay=0.0005))
+    import nasa_image_search
+    stack.enter_context(mock.patch.object(nasa_image_search, "NASA_API_URL", f"{nasa.url}/search"))
+    stack.enter_context(mock.patch.dict(os.environ, {"OPENAI_BASE_URL": openai.base_url}))
+    for name in ("OpenAIChat", "OpenAIChatBatch"):
+        stack.enter_context(mock.patch.object(classes[name], "get_config_value", return_value="sk-bench"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline JSON to compare against or update")
+    parser.add_argument("--update", action="store_true", help="write this run's results as the new baseline")
+    parser.add_argument("--output", type=Path, help="also write this run's results to a JSON file")
+    parser.add_argument("--filter", default="", help="only run workloads whose name contains this text (case-insensitive)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply iteration counts, e.g. 0.1 for a quick run")
+    parser.add_argument("--latency-tolerance", type=float, default=LATENCY_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    parser.add_argument("--memoize", action="store_true", help="leave memoization on, so repeated workloads measure cache hits")
+    args = parser.parse_args()
+
+    classes = load_node_classes()
+    # Workloads repeat the same inputs, so with memoization on most of them would only time a fingerprint check
+    memoization.configure(enabled=args.memoize)
+    every_workload = workloads(args.scale)
+    missing = sorted(set(classes) - {workload.node_class for workload in every_workload})
+    if missing:
+        raise SystemExit(f"library.json nodes without a workload: {', '.join(missing)}")
+    selected = [workload for workload in every_workload if args.filter.lower() in workload.name.lower()]
+
+    setup = run_setup(args.scale)
+    existing = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    differences = setup_differences(setup, existing["meta"]) if existing is not None else []
+    if differences and args.update and args.filter:
+        raise SystemExit(f"{args.baseline} was recorded on a different setup; update it with a full run instead")
+    if differences and not args.update:
+        print(f"not comparing against {args.baseline}, it was recorded on a different setup:")
+        for difference in differences:
+            print(f"  {difference}")
+        print("run with --update to record a baseline for this setup, or pass another with --baseline")
+    baselines = existing["results"] if existing is not None and not differences and not args.update else {}
+
+    results = []
+    with ExitStack() as stack:
+        environment(stack, classes)
+        print(f"{'workload':38s} {'iters':>6s} {'p50 ms':>9s} {'p90 ms':>9s} {'p99 ms':>9s} {'ops/s':>10s} {'MB/s':>8s} {'peak MB':>8s}")
+        for workload in selected:
+            result = measure(workload, classes)
+            compare(result, baselines.get(workload.name), args.latency_tolerance, args.memory_tolerance)
+            results.append(result)
+            mb_per_second = f"{result.mb_per_second:8.1f}" if result.mb_per_second is not None else f"{'':8s}"
+            print(
+                f"{result.name:38s} {result.iterations:6d} {result.p50_ms:9.4f} {result.p90_ms:9.4f} {result.p99_ms:9.4f}"
+                f" {result.ops_per_second:10.1f} {mb_per_second} {result.peak_mb:8.2f}"
+                + ("  REGRESSION" if result.regressions else "")
+            )
+
+    report = {
+        "meta": setup,
+        "results": {result.name: {key: value for key, value in vars(result).items() if key not in ("name", "regressions")} for result in results},
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.update:
+        if args.filter and existing is not None:
+            # Partial runs only replace the workloads they measured
+            report["results"] = {**existing["results"], **report["results"]}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return
+
+    if existing is None:
+        print(f"no baseline at {args.baseline}; run with --update to record one")
+        return
+    if differences:
+        return
+    regressions = [(result.name, message) for result in results for message in result.regressions]
+    for name, message in regressions:
+        print(f"REGRESSION {name}: {message}")
+    if regressions:
+        raise SystemExit(1)
+    print(f"no regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
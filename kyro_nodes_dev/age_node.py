@@ -1,34 +1,44 @@
-from re import S
+from functools import partial
 from griptape_nodes.exe_types.node_types import DataNode
-from griptape_nodes.exe_types.core_types import Parameter, ParameterMode
+from griptape_nodes.exe_types.core_types import ParameterMode
 from griptape_nodes.traits.minmax import MinMax
 from griptape_nodes.traits.clamp import Clamp
+from ages import AGE_MAX, AGE_MIN
+from instrumentation import instrumented
+from memoization import memoized
+from parameter_specs import ParameterSpec, add_parameters
 
 
 class Age(DataNode):
+    # Parameter definitions are built once for the class and shared by every Age node; see parameter_specs.
+    PARAMETERS = (
+        ParameterSpec(
+            name="age",
+            input_types=["int","float"],
+            type="int",
+            output_type="int",
+            default_value= 30,
+            tooltip="What is your age",
+            allowed_modes={ParameterMode.PROPERTY, ParameterMode.OUTPUT},
+            # Traits are classes that you can assign to a parameter
+            # Clamp prevents the parameter values from being set outside of that range, and MinMax raises an error if that is attempted.
+            # You can create your own traits as long as they inherit Trait from griptape_nodes.exe_types.core_types 
+            # Each node's parameter needs its own trait instances, so they're declared as factories.
+            traits=(partial(MinMax, min_val=AGE_MIN, max_val=AGE_MAX), partial(Clamp, min_val=AGE_MIN, max_val=AGE_MAX)),
+            ui_options={"slider":{"min_val":AGE_MIN, "max_val":AGE_MAX}}
+        ),
+    )
+
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
 
         self.category = "DataNodes"
         self.description = "Age Node"
-        self.add_parameter(
-            Parameter(
-                name="age",
-                input_types=["int","float"],
-                type="int",
-                output_type="int",
-                default_value= 30,
-                tooltip="What is your age",
-                allowed_modes={ParameterMode.PROPERTY, ParameterMode.OUTPUT},
-                # Traits are classes that you can assign to a parameter
-                # Clamp prevents the parameter values from being set outside of that range, and MinMax raises an error if that is attempted.
-                # You can create your own traits as long as they inherit Trait from griptape_nodes.exe_types.core_types 
-                traits={MinMax(min_val=1, max_val=98), Clamp(min_val=1, max_val=98)},
-                ui_options={"slider":{"min_val":1, "max_val":98}}
-            )
-        )
+        add_parameters(self, self.PARAMETERS)
 
 
+    @instrumented
+    @memoized()
     def process(self) -> None:
         # All of the current values of a parameter are stored on self.parameter_values (If they have an INPUT or PROPERTY)
         age = self.parameter_values["age"]
@@ -0,0 +1,14 @@
+"""The age range shared by the Age node and the batch nodes' age columns.
+
+Kept out of age_node.py so other node files can use it without importing a node module: the engine loads each node
+file itself, and importing one from another would define its node classes a second time.
+"""
+
+# Ages outside this range are clamped, in the Age node and in the batch nodes' age columns
+AGE_MIN = 1
+AGE_MAX = 98
+
+
+def clamp_ages(ages:list) -> list:
+    # Column-wise version of Age's Clamp trait. Missing ages (None) are left as they are.
+    return [age if age is None else min(max(age, AGE_MIN), AGE_MAX) for age in ages]
@@ -0,0 +1,27 @@
+"""Where this library keeps its files on disk, and how it writes them.
+
+Every cache (images, search pages, LLM responses) and the profiler's output live under cache_directory(), which
+can be moved with KYRO_NODES_CACHE_DIR. Files that readers may open at any moment are written with write_atomic().
+"""
+import os
+import tempfile
+from pathlib import Path
+
+CACHE_DIR_ENV = "KYRO_NODES_CACHE_DIR"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "kyro_nodes"
+
+
+def cache_directory() -> Path:
+    return Path(os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR)
+
+
+def write_atomic(path:Path, data:bytes) -> None:
+    # Write to a temp file and rename, so a crash or a concurrent reader never sees a partial file.
+    descriptor, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(descriptor, "wb") as handle:
+            handle.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
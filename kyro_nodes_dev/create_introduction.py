@@ -1,53 +1,109 @@
-from re import S
-from typing import Any
 from griptape_nodes.exe_types.node_types import ControlNode
-from griptape_nodes.exe_types.core_types import Parameter, ParameterMode
+from griptape_nodes.exe_types.core_types import ParameterMode
+from ages import clamp_ages
+from instrumentation import instrumented
+from memoization import memoized
+from parameter_specs import ParameterSpec, add_parameters
+
+INTRODUCTION_TEMPLATE = "Hey! My name is {}, and I'm {} years old."
+
+
+def introductions(full_names:list, ages:list) -> list:
+    # Formats whole columns in one pass; str.format with a prebuilt template avoids an f-string per row
+    if len(full_names) != len(ages):
+        raise ValueError(f"Got {len(full_names)} names but {len(ages)} ages; the columns must be the same length.")
+    return list(map(INTRODUCTION_TEMPLATE.format, full_names, ages))
+
 
 # Control Nodes import the ControlNode class.
 class CreateIntroduction(ControlNode):
+    PARAMETERS = (
+        ParameterSpec(
+            name="full name",
+            input_types=["str"],
+            type="str",
+            output_type="str",
+             # If you don't specify allowed_modes, it defaults to all three modes being allowed (INPUT, OUTPUT, and PROPERTY)
+            allowed_modes={ParameterMode.PROPERTY, ParameterMode.INPUT},
+            tooltip="The name of the user",
+        ),
+        ParameterSpec(
+            name="age",
+            input_types=["int","float"],
+            type="int",
+            output_type="int",
+            default_value= 30,
+            tooltip="What is your age",
+        ),
+        ParameterSpec(
+            name="introduction",
+            output_type="str",
+            tooltip="The user's introduction",
+            allowed_modes={ParameterMode.OUTPUT},
+            ui_options={"multiline":True}
+        ),
+    )
+
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
 
         self.category = "ControlNodes"
         self.description = "Create an introduction."
             
-        self.add_parameter(
-            Parameter(
-                name="full name",
-                input_types=["str"],
-                type="str",
-                output_type="str",
-                 # If you don't specify allowed_modes, it defaults to all three modes being allowed (INPUT, OUTPUT, and PROPERTY)
-                allowed_modes={ParameterMode.PROPERTY, ParameterMode.INPUT},
-                tooltip="The name of the user",
-            )
-        )
-        self.add_parameter(
-            Parameter(
-                name="age",
-                input_types=["int","float"],
-                type="int",
-                output_type="int",
-                default_value= 30,
-                tooltip="What is your age",
-            )
-        )
-        self.add_parameter(
-            Parameter(
-                name="introduction",
-                output_type="str",
-                tooltip="The user's introduction",
-                allowed_modes={ParameterMode.OUTPUT},
-                ui_options={"multiline":True}
-            )
-        )
+        add_parameters(self, self.PARAMETERS)
 
 
+    @instrumented
+    @memoized()
     def process(self) -> None:
         # All of the current values of a parameter are stored on self.parameter_values (If they have an INPUT or PROPERTY)
         full_name = self.parameter_values["full name"]
         age = self.parameter_values["age"]
         # All output values should be set in self.parameter_output_values. 
-        introduction= f"Hey! My name is {full_name}, and I'm {age} years old."
+        introduction= INTRODUCTION_TEMPLATE.format(full_name, age)
         self.parameter_output_values["introduction"] = introduction
-        # The node is complete!
\ No newline at end of file
+        # The node is complete!
+
+
+# Columnar version of CreateIntroduction: one execution formats an introduction for every row of the name and age columns.
+class CreateIntroductionBatch(ControlNode):
+    PARAMETERS = (
+        ParameterSpec(
+            name="full names",
+            input_types=["list"],
+            type="list",
+            output_type="list",
+            allowed_modes={ParameterMode.PROPERTY, ParameterMode.INPUT},
+            tooltip="The names of the users",
+        ),
+        ParameterSpec(
+            name="ages",
+            input_types=["list"],
+            type="list",
+            output_type="list",
+            tooltip="Their ages, in the same order as the names. Ages are clamped to the Age node's range.",
+            # Age's Clamp trait, applied to the whole column
+            converters=[clamp_ages]
+        ),
+        ParameterSpec(
+            name="introductions",
+            output_type="list",
+            type="list",
+            tooltip="The users' introductions, in input order",
+            allowed_modes={ParameterMode.OUTPUT},
+        ),
+    )
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+
+        self.category = "ControlNodes"
+        self.description = "Create introductions from lists of names and ages."
+        add_parameters(self, self.PARAMETERS)
+
+
+    @instrumented
+    def process(self) -> None:
+        full_names = self.parameter_values.get("full names") or []
+        ages = self.parameter_values.get("ages") or []
+        self.parameter_output_values["introductions"] = introductions(full_names, ages)
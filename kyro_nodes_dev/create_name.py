@@ -1,56 +1,69 @@
-from re import S
 from griptape_nodes.exe_types.node_types import DataNode
-from griptape_nodes.exe_types.core_types import Parameter, ParameterMode
+from griptape_nodes.exe_types.core_types import ParameterMode
+from instrumentation import instrumented
+from memoization import memoized
+from parameter_specs import ParameterSpec, add_parameters
+
+
+# Converters should take one positional argument of any type, and can return anything!
+def capitalize_name(value:str) -> str:
+    if not value:
+        return value
+    return value[0].upper() + value[1:]
+
+
+def capitalize_names(values:list) -> list:
+    # capitalize_name over a whole column at once, for list parameters. Empty and missing names (None) are left as they are.
+    return [value[0].upper() + value[1:] if value else value for value in values]
+
+
+def full_names(first_names:list, last_names:list) -> list:
+    if len(first_names) != len(last_names):
+        raise ValueError(f"Got {len(first_names)} first names but {len(last_names)} last names; the columns must be the same length.")
+    return list(map("{} {}".format, first_names, last_names))
 
 
 class CreateName(DataNode):
+    PARAMETERS = (
+        ParameterSpec(
+            name="first name",
+            input_types=["str"],
+            type="str",
+            allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
+            output_type="str",
+            default_value = "Jane",
+            tooltip="The first name of the user",
+            # Converters allow you to modify the value set. You can add multiple converters, that will operate in order when a parameter value is set.
+            converters=[capitalize_name]
+            # If you don't specify allowed_modes, it defaults to all three modes being allowed (INPUT, OUTPUT, and PROPERTY)
+        ),
+        ParameterSpec(
+            name="last name",
+            output_type="str",
+            type="str",
+            default_value="Smith",
+            tooltip="The last name of the user",
+            allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
+            converters=[capitalize_name]
+        ),
+        ParameterSpec(
+            name="full name",
+            output_type="str",
+            tooltip="The full name of the user",
+            allowed_modes={ParameterMode.OUTPUT}
+        ),
+    )
+
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
 
         self.category = "DataNodes"
         self.description = "An example node with dependencies"
-
-        # Converters should take one positional argument of any type, and can return anything!
-        def capitalize_name(value:str) -> str:
-            if not value:
-                return value
-            return value[0].upper() + value[1:]
-            
-        self.add_parameter(
-            Parameter(
-                name="first name",
-                input_types=["str"],
-                type="str",
-                allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
-                output_type="str",
-                default_value = "Jane",
-                tooltip="The first name of the user",
-                # Converters allow you to modify the value set. You can add multiple converters, that will operate in order when a parameter value is set.
-                converters=[capitalize_name]
-                # If you don't specify allowed_modes, it defaults to all three modes being allowed (INPUT, OUTPUT, and PROPERTY)
-            )
-        )
-        self.add_parameter(
-            Parameter(
-                name="last name",
-                output_type="str",
-                type="str",
-                default_value="Smith",
-                tooltip="The last name of the user",
-                allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
-                converters=[capitalize_name]
-            )
-        )
-        self.add_parameter(
-            Parameter(
-                name="full name",
-                output_type="str",
-                tooltip="The full name of the user",
-                allowed_modes={ParameterMode.OUTPUT}
-            )
-        )
+        add_parameters(self, self.PARAMETERS)
 
 
+    @instrumented
+    @memoized()
     def process(self) -> None:
         # All of the current values of a parameter are stored on self.parameter_values (If they have an INPUT or PROPERTY)
         first_name = self.parameter_values["first name"]
@@ -58,4 +71,50 @@ class CreateName(DataNode):
         # All output values should be set in self.parameter_output_values. 
         full_name = f"{first_name} {last_name}"
         self.parameter_output_values["full name"] = full_name
-        # The node is complete!
\ No newline at end of file
+        # The node is complete!
+
+
+# Columnar version of CreateName: one execution turns whole columns of first and last names into a column of full names.
+class CreateNameBatch(DataNode):
+    PARAMETERS = (
+        ParameterSpec(
+            name="first names",
+            input_types=["list"],
+            type="list",
+            allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
+            output_type="list",
+            tooltip="First names, one per person",
+            # The converter gets the whole list, so every name is capitalized in one pass
+            converters=[capitalize_names]
+        ),
+        ParameterSpec(
+            name="last names",
+            input_types=["list"],
+            type="list",
+            allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
+            output_type="list",
+            tooltip="Last names, in the same order as the first names",
+            converters=[capitalize_names]
+        ),
+        ParameterSpec(
+            name="full names",
+            output_type="list",
+            type="list",
+            tooltip="The full names, in input order",
+            allowed_modes={ParameterMode.OUTPUT}
+        ),
+    )
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+
+        self.category = "DataNodes"
+        self.description = "Create full names from lists of first and last names"
+        add_parameters(self, self.PARAMETERS)
+
+
+    @instrumented
+    def process(self) -> None:
+        first_names = self.parameter_values.get("first names") or []
+        last_names = self.parameter_values.get("last names") or []
+        self.parameter_output_values["full names"] = full_names(first_names, last_names)
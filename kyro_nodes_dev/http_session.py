@@ -0,0 +1,121 @@
+"""Shared HTTP session for nodes in this library.
+
+Every node that talks to a web API should go through get_session() instead of calling requests.get directly.
+The session keeps connections alive between node runs, so looping flows don't pay a new TCP/TLS handshake
+on every execution, and it retries throttled or failing requests with exponential backoff.
+"""
+import functools
+import tempfile
+import threading
+
+from instrumentation import record_external_call
+from lazy_imports import lazy_import
+
+# requests and urllib3 are imported by the first get_session() call rather than when the library registers.
+requests = lazy_import("requests")
+requests_adapters = lazy_import("requests.adapters")
+urllib3_retry = lazy_import("urllib3.util.retry")
+
+# Distinct hosts kept in the pool, and connections kept per host. Sized for a handful of concurrent nodes.
+POOL_CONNECTIONS = 8
+POOL_MAXSIZE = 32
+
+# Retries back off 0.5s, 1s, 2s... and honour Retry-After on 429/503, waiting at most RETRY_AFTER_MAX seconds.
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_AFTER_MAX = 5.0
+
+_session: "requests.Session | None" = None
+_lock = threading.Lock()
+
+
+@functools.cache
+def _retry_class() -> type:
+    # Built on first use, since urllib3 is imported lazily
+    class CappedRetry(urllib3_retry.Retry):
+        # The locked urllib3 sleeps for whatever Retry-After says, on the calling thread and outside the request
+        # timeout, so a server asking for an hour would stall the node for an hour per retry.
+        def get_retry_after(self, response) -> float | None:
+            retry_after = super().get_retry_after(response)
+            return min(retry_after, RETRY_AFTER_MAX) if retry_after is not None else None
+
+    return CappedRetry
+
+
+def _build_session() -> "requests.Session":
+    retry = _retry_class()(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        # Hand the last response back so callers see a normal HTTPError from raise_for_status()
+        raise_on_status=False,
+    )
+    adapter = requests_adapters.HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # Counted once per request the caller makes; retries inside urllib3 aren't seen here
+    session.hooks["response"].append(_count_response)
+    return session
+
+
+def _count_response(response: "requests.Response", *args, **kwargs) -> None:
+    record_external_call("http")
+
+
+def get_session() -> "requests.Session":
+    # The session is created once and shared by every node instance and thread.
+    # urllib3's connection pool is thread-safe; nodes must not mutate session-level headers or cookies.
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def close_session() -> None:
+    # Drops pooled connections. The next get_session() call builds a fresh session.
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+# Streaming downloads. Bodies are read in chunks into a spooled temp file, so small responses stay in memory,
+# large ones spill to disk, and anything over the caller's limit is rejected before it is fully read.
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+SPOOL_MEMORY_LIMIT = 8 * 1024 * 1024
+
+
+class DownloadTooLargeError(ValueError):
+    pass
+
+
+def download_to_buffer(response: "requests.Response", max_bytes: int) -> tempfile.SpooledTemporaryFile:
+    # The response must have been requested with stream=True. The returned buffer is positioned at the start;
+    # the caller owns it and should close it.
+    content_length = response.headers.get("Content-Length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        response.close()
+        raise DownloadTooLargeError(f"Response is {int(content_length)} bytes, over the {max_bytes} byte limit.")
+
+    buffer = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_LIMIT)
+    size = 0
+    try:
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                raise DownloadTooLargeError(f"Response exceeded the {max_bytes} byte limit.")
+            buffer.write(chunk)
+    except BaseException:
+        buffer.close()
+        raise
+    finally:
+        response.close()
+    buffer.seek(0)
+    return buffer
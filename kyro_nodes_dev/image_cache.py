@@ -0,0 +1,184 @@
+"""Persistent, content-addressed cache for downloaded images.
+
+Image bytes are stored once per content hash under blobs/, and each URL gets a small JSON entry under entries/
+with the blob hash, the image format and dimensions, and the ETag/Last-Modified validators from the server.
+A fresh hit therefore rebuilds an ImageArtifact without touching the network or decoding the image.
+Entries older than max_age are revalidated with a conditional request before being reused.
+
+The cache is capped at max_bytes of blob data. When it grows past the cap, the least recently used entries are
+dropped along with any blobs nothing else references.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from cache_files import cache_directory, write_atomic
+
+MAX_MB_ENV = "KYRO_NODES_IMAGE_CACHE_MB"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Reuse an entry without revalidating for a day. NASA preview images don't change once published.
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+
+@dataclass(frozen=True)
+class CachedImage:
+    url: str
+    digest: str
+    format: str
+    width: int
+    height: int
+    size: int
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = 0.0
+
+
+def _url_key(url:str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class ImageCache:
+    def __init__(self, directory:str | os.PathLike | None=None, max_bytes:int=DEFAULT_MAX_BYTES, max_age:float=DEFAULT_MAX_AGE) -> None:
+        self.directory = Path(directory) if directory is not None else cache_directory() / "images"
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._entries = self.directory / "entries"
+        self._blobs = self.directory / "blobs"
+        self._lock = threading.Lock()
+        # Running total of blob bytes, counted from disk on the first put() and kept up to date after that.
+        # Other processes sharing the directory aren't seen until the next eviction pass recounts.
+        self._total_bytes: int | None = None
+        self._entries.mkdir(parents=True, exist_ok=True)
+        self._blobs.mkdir(parents=True, exist_ok=True)
+
+    def get(self, url:str) -> CachedImage | None:
+        entry_path = self._entries / f"{_url_key(url)}.json"
+        try:
+            entry = CachedImage(**json.loads(entry_path.read_text()))
+            if not (self._blobs / entry.digest).exists():
+                return None
+            # The entry's mtime is its last access time, which drives LRU eviction.
+            # A concurrent eviction can remove the entry at any point, which is just a miss.
+            os.utime(entry_path)
+        except (OSError, ValueError, TypeError):
+            return None
+        return entry
+
+    def is_fresh(self, entry:CachedImage) -> bool:
+        return time.time() - entry.fetched_at < self.max_age
+
+    def read(self, entry:CachedImage) -> bytes:
+        return (self._blobs / entry.digest).read_bytes()
+
+    def validators(self, entry:CachedImage) -> dict[str, str]:
+        # Conditional request headers that let the server answer 304 Not Modified.
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def put(self, url:str, data:bytes, format:str, width:int, height:int, etag:str | None=None, last_modified:str | None=None) -> CachedImage:
+        digest = hashlib.sha256(data).hexdigest()
+        entry = CachedImage(
+            url=url,
+            digest=digest,
+            format=format,
+            width=width,
+            height=height,
+            size=len(data),
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=time.time(),
+        )
+        with self._lock:
+            blob_path = self._blobs / digest
+            added = 0
+            if not blob_path.exists():
+                write_atomic(blob_path, data)
+                added = len(data)
+            if self._total_bytes is None:
+                self._total_bytes = sum(self._blob_sizes().values())
+            else:
+                self._total_bytes += added
+            self._write_entry(entry)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+        return entry
+
+    def revalidated(self, entry:CachedImage) -> CachedImage:
+        # The server answered 304, so the stored bytes are still current for another max_age.
+        entry = CachedImage(**{**asdict(entry), "fetched_at": time.time()})
+        with self._lock:
+            self._write_entry(entry)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in [*self._entries.iterdir(), *self._blobs.iterdir()]:
+                path.unlink(missing_ok=True)
+            self._total_bytes = 0
+
+    def _write_entry(self, entry:CachedImage) -> None:
+        write_atomic(self._entries / f"{_url_key(entry.url)}.json", json.dumps(asdict(entry)).encode("utf-8"))
+
+    def _blob_sizes(self) -> dict[str, int]:
+        sizes = {}
+        for path in self._blobs.iterdir():
+            if not path.name.startswith("."):
+                try:
+                    sizes[path.name] = path.stat().st_size
+                except FileNotFoundError:
+                    pass
+        return sizes
+
+    def _evict(self) -> None:
+        # Only called once the running total is over the cap, so the directory scan isn't paid on every put().
+        blob_sizes = self._blob_sizes()
+        total = self._total_bytes = sum(blob_sizes.values())
+        if total <= self.max_bytes:
+            return
+        entries = []
+        for path in self._entries.glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime, path, json.loads(path.read_text())["digest"]))
+            except (OSError, ValueError, KeyError):
+                path.unlink(missing_ok=True)
+        entries.sort(key=lambda item: item[0])
+        references: dict[str, int] = {}
+        for _, _, digest in entries:
+            references[digest] = references.get(digest, 0) + 1
+        # Blobs whose entry never got written (e.g. a crash mid-put) would otherwise hold the total over the cap forever
+        for digest, size in blob_sizes.items():
+            if digest not in references:
+                (self._blobs / digest).unlink(missing_ok=True)
+                total -= size
+        for _, path, digest in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            references[digest] -= 1
+            if references[digest] == 0 and digest in blob_sizes:
+                (self._blobs / digest).unlink(missing_ok=True)
+                total -= blob_sizes[digest]
+        self._total_bytes = total
+
+
+_cache: ImageCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_image_cache() -> ImageCache:
+    # One cache per process, shared by every node instance. The size cap can be set in megabytes via the environment.
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                max_mb = os.environ.get(MAX_MB_ENV)
+                _cache = ImageCache(max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES)
+    return _cache
@@ -0,0 +1,68 @@
+"""Downscaling and format conversion for downloaded images.
+
+Image.thumbnail() calls draft() before loading, so JPEGs are decoded directly at a reduced scale by libjpeg's DCT
+scaling, then finished with reduce() and a resample. A large JPEG is therefore never decoded at full size.
+Pillow releases the GIL while decoding and encoding, so transcodes run right in the thread that downloaded the
+image, and the NASA node's download threads transcode several images at once.
+"""
+from dataclasses import dataclass
+from io import BytesIO
+
+from lazy_imports import lazy_import
+
+# Pillow is only needed once an image is actually transcoded
+Image = lazy_import("PIL.Image")
+
+# Formats an ImageArtifact can be converted to, by their lower-case artifact names.
+OUTPUT_FORMATS = {"jpeg": "JPEG", "png": "PNG", "webp": "WEBP"}
+
+
+@dataclass(frozen=True)
+class TranscodeSettings:
+    max_dimension: int = 0
+    output_format: str | None = None
+    quality: int = 85
+
+    @property
+    def cache_suffix(self) -> str:
+        # Appended to the image URL so each (url, settings) pair gets its own cache entry
+        return f"#max={self.max_dimension};format={self.output_format or 'original'};quality={self.quality}"
+
+
+def transcode_settings(max_dimension:int | None, output_format:str | None, quality:int | None) -> TranscodeSettings | None:
+    # Returns None when the settings would leave the image untouched.
+    output_format = (output_format or "").lower().strip()
+    if output_format in ("", "original"):
+        output_format = None
+    elif output_format == "jpg":
+        output_format = "jpeg"
+    if output_format is not None and output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format '{output_format}'. Use one of: original, {', '.join(OUTPUT_FORMATS)}.")
+    if not max_dimension and output_format is None:
+        return None
+    return TranscodeSettings(max_dimension=max_dimension or 0, output_format=output_format, quality=quality or 85)
+
+
+def transcode_image(data:bytes, settings:TranscodeSettings) -> tuple[bytes, str, int, int]:
+    # Returns the new bytes, artifact format, width and height.
+    with Image.open(BytesIO(data)) as img:
+        source_format = (img.format or "png").lower()
+        target_format = settings.output_format or source_format
+        if target_format not in OUTPUT_FORMATS:
+            # Pillow can read more formats than we write; fall back to PNG so nothing is lost
+            target_format = "png"
+        needs_resize = settings.max_dimension and max(img.size) > settings.max_dimension
+        if not needs_resize and target_format == source_format:
+            return data, source_format, img.width, img.height
+
+        if needs_resize:
+            img.thumbnail((settings.max_dimension, settings.max_dimension))
+        else:
+            img.load()
+        if target_format == "jpeg" and img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+
+        output = BytesIO()
+        save_options = {"quality": settings.quality} if target_format in ("jpeg", "webp") else {"optimize": True}
+        img.save(output, format=OUTPUT_FORMATS[target_format], **save_options)
+        return output.getvalue(), target_format, img.width, img.height
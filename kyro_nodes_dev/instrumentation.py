@@ -0,0 +1,336 @@
+"""Per-run metrics for the nodes in this library.
+
+Decorate a node's process() with @instrumented to record, for every run, its wall time, CPU time, approximate
+bytes in (parameter_values) and out (parameter_output_values), and external calls made while it ran. Helpers report
+calls with record_external_call(), e.g. the shared HTTP session counts every response and the OpenAI clients count
+every request. Work handed to a thread pool is only attributed to the run if it's wrapped with propagate_run().
+
+Nothing is recorded unless metrics are switched on, so the only cost of a disabled decorator is one flag check:
+
+    KYRO_NODES_METRICS=1                   aggregate runs into get_registry()
+    KYRO_NODES_METRICS_FILE=runs.jsonl     also append every run to a JSON-lines file (implies KYRO_NODES_METRICS)
+    KYRO_NODES_PROFILE=cprofile,tracemalloc
+                                           capture a cProfile dump and/or the traced memory peak of every run
+                                           (implies KYRO_NODES_METRICS)
+    KYRO_NODES_PROFILE_DIR=...             where .prof files go, default <cache directory>/profiles
+
+The environment is read at import; call configure() to change settings at runtime.
+"""
+import contextvars
+import cProfile
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable
+
+from cache_files import cache_directory
+
+METRICS_ENV = "KYRO_NODES_METRICS"
+METRICS_FILE_ENV = "KYRO_NODES_METRICS_FILE"
+PROFILE_ENV = "KYRO_NODES_PROFILE"
+PROFILE_DIR_ENV = "KYRO_NODES_PROFILE_DIR"
+PROFILERS = ("cprofile", "tracemalloc")
+
+# Allocation sites kept per run when tracemalloc is on
+TRACEMALLOC_TOP = 5
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Settings:
+    enabled: bool = False
+    metrics_file: Path | None = None
+    profile: frozenset[str] = frozenset()
+    profile_dir: Path | None = None
+
+
+@dataclass
+class RunMetrics:
+    node_class: str
+    node_name: str | None
+    started_at: float
+    wall_seconds: float = 0.0
+    # CPU time of the whole process while the node ran, so it includes the node's worker threads
+    cpu_seconds: float = 0.0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    external_calls: dict[str, int] = field(default_factory=dict)
+    error: str | None = None
+    profile_path: str | None = None
+    peak_memory_bytes: int | None = None
+    top_allocations: list[str] | None = None
+
+
+def _settings_from_env() -> Settings:
+    metrics_file = os.environ.get(METRICS_FILE_ENV) or None
+    profile = frozenset(name.strip().lower() for name in os.environ.get(PROFILE_ENV, "").split(",") if name.strip())
+    unknown = profile - set(PROFILERS)
+    if unknown:
+        # Read at import, so a typo must not stop the library from registering
+        logger.warning("Ignoring unknown %s values: %s (expected %s)", PROFILE_ENV, ", ".join(sorted(unknown)), ", ".join(PROFILERS))
+        profile -= unknown
+    enabled = os.environ.get(METRICS_ENV, "").lower() in ("1", "true", "yes", "on") or bool(metrics_file) or bool(profile)
+    profile_dir = os.environ.get(PROFILE_DIR_ENV)
+    return Settings(
+        enabled=enabled,
+        metrics_file=Path(metrics_file).expanduser() if metrics_file else None,
+        profile=profile,
+        profile_dir=Path(profile_dir).expanduser() if profile_dir else None,
+    )
+
+
+_settings = _settings_from_env()
+_current_run: contextvars.ContextVar[RunMetrics | None] = contextvars.ContextVar("kyro_nodes_run", default=None)
+_calls_lock = threading.Lock()
+_sink_lock = threading.Lock()
+# The sink stays open between runs; it's reopened if configure() points it somewhere else
+_sink_file = None
+
+
+def configure(enabled:bool | None=None, metrics_file:str | Path | None=None, profile:set[str] | None=None) -> Settings:
+    # With no arguments, re-reads the environment. Arguments override it.
+    # A sink file or profiler switches metrics on unless enabled=False says otherwise.
+    global _settings
+    settings = _settings_from_env()
+    if profile is not None:
+        settings = replace(settings, profile=frozenset(profile) & frozenset(PROFILERS))
+    if metrics_file is not None:
+        settings = replace(settings, metrics_file=Path(metrics_file))
+    if enabled is None:
+        enabled = settings.enabled or settings.metrics_file is not None or bool(settings.profile)
+    _settings = replace(settings, enabled=enabled)
+    return _settings
+
+
+def is_enabled() -> bool:
+    return _settings.enabled
+
+
+def payload_size(value:Any) -> int:
+    # Rough size of a parameter value: characters for text, length for bytes, summed through containers and artifacts.
+    if value is None or isinstance(value, bool):
+        return 0
+    if isinstance(value, (str, bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, (int, float)):
+        return 8
+    if isinstance(value, dict):
+        return sum(payload_size(item) for item in value.values())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sum(payload_size(item) for item in value)
+    if hasattr(value, "value"):
+        return payload_size(value.value)
+    return 0
+
+
+def record_external_call(kind:str, count:int=1) -> None:
+    # Attributes a call to the node run in progress on this thread, if any.
+    run = _current_run.get()
+    if run is None:
+        return
+    with _calls_lock:
+        run.external_calls[kind] = run.external_calls.get(kind, 0) + count
+
+
+def propagate_run(function:Callable) -> Callable:
+    # Thread pools don't carry context variables over, so wrap work submitted to one to keep counting its calls.
+    run = _current_run.get()
+    if run is None:
+        return function
+
+    @functools.wraps(function)
+    def call(*args, **kwargs):
+        token = _current_run.set(run)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _current_run.reset(token)
+    return call
+
+
+class MetricsRegistry:
+    """Running totals per node class. Everything is a sum or a max, so sink files from several processes aggregate with load_jsonl()."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict] = {}
+
+    def record(self, run:RunMetrics) -> None:
+        with self._lock:
+            stats = self._stats.get(run.node_class)
+            if stats is None:
+                stats = self._stats[run.node_class] = {
+                    "runs": 0, "errors": 0, "wall_seconds": 0.0, "max_wall_seconds": 0.0, "cpu_seconds": 0.0,
+                    "bytes_in": 0, "bytes_out": 0, "external_calls": Counter(),
+                }
+            stats["runs"] += 1
+            stats["errors"] += 1 if run.error else 0
+            stats["wall_seconds"] += run.wall_seconds
+            stats["max_wall_seconds"] = max(stats["max_wall_seconds"], run.wall_seconds)
+            stats["cpu_seconds"] += run.cpu_seconds
+            stats["bytes_in"] += run.bytes_in
+            stats["bytes_out"] += run.bytes_out
+            if run.external_calls:
+                stats["external_calls"].update(run.external_calls)
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            return {
+                node_class: {**stats, "external_calls": dict(stats["external_calls"]), "mean_wall_seconds": stats["wall_seconds"] / stats["runs"]}
+                for node_class, stats in self._stats.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+def load_jsonl(path:str | Path) -> MetricsRegistry:
+    # Aggregates a JSON-lines sink file, e.g. one collected from another process.
+    registry = MetricsRegistry()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                registry.record(RunMetrics(**json.loads(line)))
+    return registry
+
+
+_registry: MetricsRegistry | None = None
+_lock = threading.Lock()
+
+
+def get_registry() -> MetricsRegistry:
+    global _registry
+    if _registry is None:
+        with _lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
+
+
+def _publish(run:RunMetrics, settings:Settings) -> None:
+    get_registry().record(run)
+    if settings.metrics_file is None:
+        return
+    global _sink_file
+    # vars() rather than asdict(): the fields are already JSON types and asdict's deep copy costs more than the run
+    line = json.dumps(vars(run)) + "\n"
+    try:
+        with _sink_lock:
+            if _sink_file is None or _sink_file.name != str(settings.metrics_file):
+                if _sink_file is not None:
+                    _sink_file.close()
+                settings.metrics_file.parent.mkdir(parents=True, exist_ok=True)
+                _sink_file = open(settings.metrics_file, "a", encoding="utf-8")
+            _sink_file.write(line)
+            _sink_file.flush()
+    except OSError as e:
+        # Losing a metrics line must never fail the node
+        logger.warning("Could not write node metrics to %s: %s", settings.metrics_file, e)
+
+
+# Runs currently tracing allocations. Tracing is global, so overlapping runs share it and it stops with the last one.
+_tracing_lock = threading.Lock()
+_tracing_runs = 0
+# Whether this module started tracing, rather than finding it already on
+_started_tracing = False
+
+
+def _start_tracing() -> int:
+    # Returns the memory traced when the run starts. The peak is only reset when no other run is tracing, so a run
+    # that overlaps another reports the peak since the earlier one began.
+    global _tracing_runs, _started_tracing
+    with _tracing_lock:
+        if _tracing_runs == 0:
+            _started_tracing = not tracemalloc.is_tracing()
+            if _started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        _tracing_runs += 1
+        return tracemalloc.get_traced_memory()[0]
+
+
+def _stop_tracing() -> None:
+    global _tracing_runs
+    with _tracing_lock:
+        _tracing_runs -= 1
+        if _tracing_runs == 0 and _started_tracing:
+            tracemalloc.stop()
+
+
+def _save_profile(profiler:cProfile.Profile, run:RunMetrics, settings:Settings) -> None:
+    profile_dir = settings.profile_dir or cache_directory() / "profiles"
+    path = profile_dir / f"{run.node_class}-{run.node_name or 'node'}-{int(run.started_at * 1000)}.prof"
+    try:
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(path)
+    except OSError as e:
+        # Like the metrics sink, a profile that can't be saved must never fail the node
+        logger.warning("Could not write a profile to %s: %s", profile_dir, e)
+        return
+    run.profile_path = str(path)
+
+
+def _run_instrumented(process:Callable, node:Any, args:tuple, kwargs:dict, settings:Settings) -> Any:
+    run = RunMetrics(node_class=type(node).__name__, node_name=getattr(node, "name", None), started_at=time.time())
+    run.bytes_in = payload_size(node.parameter_values)
+    token = _current_run.set(run)
+
+    profiler = None
+    if "cprofile" in settings.profile:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already running, e.g. a nested instrumented call
+            profiler = None
+    traced_at_start = _start_tracing() if "tracemalloc" in settings.profile else 0
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        return process(node, *args, **kwargs)
+    except BaseException as e:
+        run.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        run.wall_seconds = time.perf_counter() - wall_start
+        run.cpu_seconds = time.process_time() - cpu_start
+        _current_run.reset(token)
+        # Teardown failures are logged, not raised: they'd replace the node's own result or exception
+        if profiler is not None:
+            try:
+                profiler.disable()
+                _save_profile(profiler, run, settings)
+            except Exception:
+                logger.warning("Could not profile %s", run.node_class, exc_info=True)
+        if "tracemalloc" in settings.profile:
+            try:
+                run.peak_memory_bytes = tracemalloc.get_traced_memory()[1] - traced_at_start
+                top = tracemalloc.take_snapshot().statistics("lineno")[:TRACEMALLOC_TOP]
+                run.top_allocations = [str(stat) for stat in top]
+            except Exception:
+                logger.warning("Could not trace memory for %s", run.node_class, exc_info=True)
+            finally:
+                _stop_tracing()
+        run.bytes_out = payload_size(node.parameter_output_values)
+        _publish(run, settings)
+
+
+def instrumented(process:Callable) -> Callable:
+    # Decorator for BaseNode.process. A plain pass-through call while metrics are off.
+    @functools.wraps(process)
+    def wrapper(self, *args, **kwargs):
+        settings = _settings
+        if not settings.enabled:
+            return process(self, *args, **kwargs)
+        return _run_instrumented(process, self, args, kwargs, settings)
+    return wrapper
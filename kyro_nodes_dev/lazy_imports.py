@@ -0,0 +1,49 @@
+"""Deferred imports for heavy dependencies.
+
+The engine imports every node file when it registers library.json, so anything imported at module level is paid
+for even by flows that never use the node. Modules like openai, requests, PIL and griptape.structures are bound
+with lazy_import() instead, and only really imported the first time one of their attributes is used, which
+happens inside process() or validate_node().
+
+    requests = lazy_import("requests")
+    ...
+    requests.get(url)  # first use imports requests
+"""
+import importlib
+import sys
+import threading
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule(ModuleType):
+    def __init__(self, name:str) -> None:
+        super().__init__(name)
+        self._lock = threading.Lock()
+        self._module: ModuleType | None = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self.__name__)
+        return self._module
+
+    def __getattr__(self, name:str) -> Any:
+        # Only called for attributes not set in __init__, i.e. everything from the real module
+        return getattr(self._load(), name)
+
+    def __dir__(self) -> list[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name:str) -> ModuleType:
+    # Returns the real module if something already imported it, otherwise a proxy that imports on first use.
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
@@ -0,0 +1,191 @@
+"""Skips recomputing a node whose inputs haven't changed since it last ran.
+
+Decorate a pure node's process() with @memoized() and every run fingerprints the node's parameter_values. If the
+fingerprint matches the node's previous run, the previous parameter_output_values are put back instead of running
+process() again. Nodes with expensive outputs can also keep a bounded LRU of earlier results, shared by every
+instance of the class, so alternating inputs or several nodes with the same inputs still hit. Memoized runs start
+from empty parameter_output_values, as they do under the engine, so a result holds only what its own run wrote and
+never outputs left over from an earlier run.
+
+Only plain values are fingerprinted (str, bytes, numbers, None and lists/tuples/dicts/sets of them). A node with any
+other value in parameter_values, such as an artifact, just runs normally. Strings are compared by equality, which
+for the same object is an identity check, so a large unchanged input costs next to nothing to check.
+
+Set KYRO_NODES_MEMOIZE=0 to turn memoization off everywhere, or call configure(enabled=False).
+Hit counts per node class are available from memo_stats().
+"""
+import functools
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from instrumentation import payload_size
+
+MEMOIZE_ENV = "KYRO_NODES_MEMOIZE"
+
+
+def _enabled_from_env() -> bool:
+    return os.environ.get(MEMOIZE_ENV, "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+_enabled = _enabled_from_env()
+
+
+def configure(enabled:bool | None=None) -> bool:
+    # With no argument, re-reads the environment.
+    global _enabled
+    _enabled = _enabled_from_env() if enabled is None else enabled
+    return _enabled
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _freeze(value:Any) -> Any:
+    # Scalars carry their type so 1, 1.0 and True don't share a fingerprint; they format differently.
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (bool, int, float, bytes)):
+        return (type(value), value)
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(map(_freeze, value)))
+    if isinstance(value, dict):
+        return (dict, tuple(sorted((key, _freeze(item)) for key, item in value.items())))
+    if isinstance(value, (set, frozenset)):
+        return (type(value), frozenset(map(_freeze, value)))
+    # Anything else may be mutable in place, so it can't be trusted to mean the same inputs next time
+    raise TypeError(f"can't fingerprint {type(value).__name__}")
+
+
+def fingerprint(values:dict, ignore:frozenset[str]=frozenset()) -> tuple | None:
+    # A hashable snapshot of the values, or None if any of them can't be fingerprinted.
+    try:
+        return tuple(sorted((name, _freeze(value)) for name, value in values.items() if name not in ignore))
+    except TypeError:
+        return None
+
+
+@dataclass
+class MemoStats:
+    hits: int = 0
+    misses: int = 0
+    # Runs that opted out or had inputs that can't be fingerprinted. Nothing is counted while memoization is off.
+    bypassed: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+_stats: dict[str, MemoStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _count(node_class:str, outcome:str) -> None:
+    with _stats_lock:
+        stats = _stats.get(node_class)
+        if stats is None:
+            stats = _stats[node_class] = MemoStats()
+        setattr(stats, outcome, getattr(stats, outcome) + 1)
+
+
+def memo_stats() -> dict[str, dict]:
+    with _stats_lock:
+        return {node_class: {"hits": s.hits, "misses": s.misses, "bypassed": s.bypassed, "hit_rate": s.hit_rate} for node_class, s in _stats.items()}
+
+
+def reset_memo_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+class _ResultCache:
+    # LRU of outputs by fingerprint, bounded by entry count and by the approximate size of the cached values.
+
+    def __init__(self, max_entries:int, max_bytes:int | None) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, tuple[dict, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key:tuple) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key:tuple, outputs:dict) -> None:
+        size = payload_size(key) + payload_size(outputs) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (outputs, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+def memoized(cache_size:int=0, max_bytes:int | None=None, ignore:tuple[str, ...]=(), bypass:Callable[[Any], bool] | None=None) -> Callable:
+    """Decorator for the process() of a node whose outputs depend only on its parameter_values.
+
+    cache_size > 0 adds a class-wide LRU of that many earlier results, capped at max_bytes of inputs plus outputs.
+    Parameters named in ignore don't affect the outputs and are left out of the fingerprint. When bypass(node) is
+    true the run isn't memoized, e.g. because it reads a file whose contents the fingerprint can't see.
+    """
+    ignored = frozenset(ignore)
+
+    def decorate(process:Callable) -> Callable:
+        results = _ResultCache(cache_size, max_bytes) if cache_size > 0 else None
+
+        @functools.wraps(process)
+        def wrapper(self, *args, **kwargs):
+            if not _enabled:
+                return process(self, *args, **kwargs)
+            node_class = type(self).__name__
+            key = fingerprint(self.parameter_values, ignored) if not (bypass and bypass(self)) else None
+            if key is None:
+                _count(node_class, "bypassed")
+                return process(self, *args, **kwargs)
+
+            outputs = None
+            last = getattr(self, "_memo_last", None)
+            if last is not None and last[0] == key:
+                outputs = last[1]
+            elif results is not None:
+                outputs = results.get(key)
+            # The engine clears outputs before every run; doing it here too keeps direct process() calls from
+            # recording, or keeping, outputs that an earlier run left behind
+            self.parameter_output_values.clear()
+            if outputs is not None:
+                self.parameter_output_values.update(outputs)
+                self._memo_last = (key, outputs)
+                _count(node_class, "hits")
+                return None
+
+            result = process(self, *args, **kwargs)
+            outputs = dict(self.parameter_output_values)
+            self._memo_last = (key, outputs)
+            if results is not None:
+                results.put(key, outputs)
+            _count(node_class, "misses")
+            return result
+
+        wrapper.memo_cache = results
+        return wrapper
+    return decorate
@@ -1,101 +1,232 @@
-import requests
-from griptape.artifacts import ImageArtifact
 from griptape_nodes.exe_types.node_types import ControlNode
-from griptape_nodes.exe_types.core_types import Parameter, ParameterMode, ParameterUIOptions
-from PIL import Image
-from io import BytesIO
+from griptape_nodes.exe_types.core_types import ParameterMode, ParameterUIOptions
+from griptape_nodes.traits.minmax import MinMax
+from griptape_nodes.traits.clamp import Clamp
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http_session import download_to_buffer, get_session
+from cache_files import cache_directory
+from image_cache import CachedImage, get_image_cache
+from image_transcode import TranscodeSettings, transcode_image, transcode_settings
+from instrumentation import instrumented, propagate_run
+from lazy_imports import lazy_import
+from parameter_specs import ParameterSpec, add_parameters
+from ttl_cache import TTLCache
+
+# Heavy dependencies are imported on first use in process(), not when the library registers
+requests = lazy_import("requests")
+artifacts = lazy_import("griptape.artifacts")
+Image = lazy_import("PIL.Image")
+
+NASA_API_URL = "https://images-api.nasa.gov/search"
+
+# Searches fetch a whole page of results at once. Later result indexes for the same query are then served from
+# the cached page instead of another round trip.
+SEARCH_PAGE_SIZE = 25
+SEARCH_CACHE_TTL = 60 * 60
+# Set to 1 to also keep search pages on disk, so they survive engine restarts.
+SEARCH_CACHE_ON_DISK_ENV = "KYRO_NODES_SEARCH_CACHE_ON_DISK"
+
+# Images larger than this are rejected while streaming, unless the node's max_image_mb says otherwise.
+DEFAULT_MAX_IMAGE_MB = 50
+
+# Upper bound on concurrent image downloads when more than one result is requested.
+MAX_DOWNLOAD_WORKERS = 8
+# Larger result_count values are clamped to this, so one run reads at most four search pages and this many images.
+MAX_RESULT_COUNT = 100
+
+_search_cache: TTLCache | None = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> TTLCache:
+    global _search_cache
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                directory = cache_directory() / "search" if os.environ.get(SEARCH_CACHE_ON_DISK_ENV) == "1" else None
+                _search_cache = TTLCache(ttl=SEARCH_CACHE_TTL, directory=directory)
+    return _search_cache
 
 # Define custom exception for API errors
 class NasaApiError(Exception):
     pass
 
 class NasaImageSearchNode(ControlNode):
-    def __init__(self, **kwargs) -> None:
-        super().__init__(**kwargs)
-
+    PARAMETERS = (
         # Define input parameters based on the NASA API docs
         # https://images.nasa.gov/docs/images.nasa.gov_api_docs.pdf
-        self.add_parameter(
-            Parameter(
-                name="query",
-                type="str",
-                tooltip="Search terms (e.g., 'apollo 11', 'mars rover'). Required.",
-                allowed_modes=[ParameterMode.INPUT, ParameterMode.PROPERTY],
-                default_value="apollo 11"
-            )
-        )
-        self.add_parameter(
-            Parameter(
-                name="year_start",
-                type="str", # API expects string YYYY
-                tooltip="Start year for search range (e.g., '1969'). Optional.",
-                allowed_modes=[ParameterMode.INPUT, ParameterMode.PROPERTY],
-            )
-        )
-        self.add_parameter(
-            Parameter(
-                name="year_end",
-                type="str", # API expects string YYYY
-                tooltip="End year for search range (e.g., '1972'). Optional.",
-                allowed_modes=[ParameterMode.INPUT, ParameterMode.PROPERTY],
-            )
-        )
+        ParameterSpec(
+            name="query",
+            type="str",
+            tooltip="Search terms (e.g., 'apollo 11', 'mars rover'). Required.",
+            allowed_modes=[ParameterMode.INPUT, ParameterMode.PROPERTY],
+            default_value="apollo 11"
+        ),
+        ParameterSpec(
+            name="year_start",
+            type="str", # API expects string YYYY
+            tooltip="Start year for search range (e.g., '1969'). Optional.",
+            allowed_modes=[ParameterMode.INPUT, ParameterMode.PROPERTY],
+        ),
+        ParameterSpec(
+            name="year_end",
+            type="str", # API expects string YYYY
+            tooltip="End year for search range (e.g., '1972'). Optional.",
+            allowed_modes=[ParameterMode.INPUT, ParameterMode.PROPERTY],
+        ),
+        ParameterSpec(
+            name="result_index",
+            type="int",
+            default_value=0,
+            tooltip="Which match to return, starting at 0. Results from the same search page are served from the cache.",
+            allowed_modes=[ParameterMode.INPUT, ParameterMode.PROPERTY],
+        ),
+        ParameterSpec(
+            name="result_count",
+            type="int",
+            default_value=1,
+            tooltip=f"How many matches to return, starting at result_index, up to {MAX_RESULT_COUNT}. Their images are downloaded concurrently into the list outputs.",
+            allowed_modes=[ParameterMode.INPUT, ParameterMode.PROPERTY],
+        ),
+        ParameterSpec(
+            name="max_image_mb",
+            type="int",
+            default_value=DEFAULT_MAX_IMAGE_MB,
+            tooltip="Largest image to download, in megabytes. Bigger images are reported as errors instead of being loaded.",
+            allowed_modes=[ParameterMode.PROPERTY],
+        ),
+        # Optional output processing. Leaving these at their defaults passes the original image through untouched.
+        ParameterSpec(
+            name="max_dimension",
+            type="int",
+            default_value=0,
+            tooltip="Downscale images so their longest side is at most this many pixels. 0 keeps the original size.",
+            allowed_modes=[ParameterMode.INPUT, ParameterMode.PROPERTY],
+        ),
+        ParameterSpec(
+            name="output_format",
+            type="str",
+            default_value="original",
+            tooltip="Convert images to 'jpeg', 'png' or 'webp'. 'original' keeps the format the server returned.",
+            allowed_modes=[ParameterMode.INPUT, ParameterMode.PROPERTY],
+        ),
+        ParameterSpec(
+            name="quality",
+            type="int",
+            default_value=85,
+            tooltip="Encoder quality for jpeg and webp output.",
+            allowed_modes=[ParameterMode.INPUT, ParameterMode.PROPERTY],
+            traits=(partial(MinMax, min_val=1, max_val=100), partial(Clamp, min_val=1, max_val=100)),
+            ui_options={"slider":{"min_val":1, "max_val":100}}
+        ),
         # Let's fix media_type to 'image' as we specifically want images
         # If needed later, this could become a Parameter.
-
+        ParameterSpec(
+            name="use_cache",
+            type="bool",
+            default_value=True,
+            tooltip="Reuse cached search results and previously downloaded images instead of requesting them again.",
+            allowed_modes=[ParameterMode.PROPERTY],
+        ),
         # Define output parameters
-        self.add_parameter(
-            Parameter(
-                name="image_url",
-                type="str",
-                tooltip="URL of the first matching image found (preview size).",
-                allowed_modes=[ParameterMode.OUTPUT],
-            )
-        )
-        self.add_parameter(
-            Parameter(
-                name="image_title",
-                type="str",
-                tooltip="Title of the found image.",
-                allowed_modes=[ParameterMode.OUTPUT],
-            )
-        )
-        self.add_parameter(
-            Parameter(
-                name="image_description",
-                type="str",
-                tooltip="Description of the found image.",
-                allowed_modes=[ParameterMode.OUTPUT],
-            )
-        )
-        self.add_parameter(
-            Parameter(
-                name="error_message",
-                type="str",
-                tooltip="Error message if the API call fails or no image is found.",
-                allowed_modes=[ParameterMode.OUTPUT],
-            )
-        )
+        ParameterSpec(
+            name="image_url",
+            type="str",
+            tooltip="URL of the first matching image found (preview size).",
+            allowed_modes=[ParameterMode.OUTPUT],
+        ),
+        ParameterSpec(
+            name="image_title",
+            type="str",
+            tooltip="Title of the found image.",
+            allowed_modes=[ParameterMode.OUTPUT],
+        ),
+        ParameterSpec(
+            name="image_description",
+            type="str",
+            tooltip="Description of the found image.",
+            allowed_modes=[ParameterMode.OUTPUT],
+        ),
+        ParameterSpec(
+            name="error_message",
+            type="str",
+            tooltip="Error message if the API call fails or no image is found.",
+            allowed_modes=[ParameterMode.OUTPUT],
+        ),
+        # List outputs hold every requested match, in result order
+        ParameterSpec(
+            name="images",
+            type="list",
+            tooltip="ImageArtifacts for all requested matches. An entry is None if that image could not be downloaded.",
+            allowed_modes=[ParameterMode.OUTPUT],
+        ),
+        ParameterSpec(
+            name="image_titles",
+            type="list",
+            tooltip="Titles of all requested matches.",
+            allowed_modes=[ParameterMode.OUTPUT],
+        ),
+        ParameterSpec(
+            name="image_descriptions",
+            type="list",
+            tooltip="Descriptions of all requested matches.",
+            allowed_modes=[ParameterMode.OUTPUT],
+        ),
+        ParameterSpec(
+            name="image_urls",
+            type="list",
+            tooltip="Preview URLs of all requested matches.",
+            allowed_modes=[ParameterMode.OUTPUT],
+        ),
+        ParameterSpec(
+            name="errors",
+            type="list",
+            tooltip="Per-match error messages. An entry is None if that match succeeded.",
+            allowed_modes=[ParameterMode.OUTPUT],
+        ),
         # Add new parameter for the image artifact
-        self.add_parameter(
-            Parameter(
-                name="image",
-                type="ImageArtifact",
-                input_types=["ImageArtifact", "BlobArtifact"],
-                tooltip="The downloaded NASA image as an ImageArtifact.",
-                allowed_modes=[ParameterMode.OUTPUT, ParameterMode.PROPERTY],
-                ui_options=ParameterUIOptions(
-                    image_type_options=ParameterUIOptions.ImageType(expander=True, clickable_file_browser=True)
-                )
+        ParameterSpec(
+            name="image",
+            type="ImageArtifact",
+            input_types=["ImageArtifact", "BlobArtifact"],
+            tooltip="The downloaded NASA image as an ImageArtifact.",
+            allowed_modes=[ParameterMode.OUTPUT, ParameterMode.PROPERTY],
+            ui_options=lambda: ParameterUIOptions(
+                image_type_options=ParameterUIOptions.ImageType(expander=True, clickable_file_browser=True)
             )
-        )
+        ),
+    )
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        add_parameters(self, self.PARAMETERS)
+
+    def validate_node(self) -> list[Exception] | None:
+        # Catches bad property values before the flow runs; process() checks again for values that arrive on inputs.
+        error = self._parameter_error()
+        return [ValueError(error)] if error else None
 
+    def _parameter_error(self) -> str | None:
+        result_index = self.parameter_values.get("result_index")
+        if result_index is not None and result_index < 0:
+            return f"result_index must be 0 or more, got {result_index}."
+        max_image_mb = self.parameter_values.get("max_image_mb")
+        if max_image_mb is not None and max_image_mb <= 0:
+            return f"max_image_mb must be more than 0, got {max_image_mb}. Leave it empty to use the {DEFAULT_MAX_IMAGE_MB} MB default."
+        return None
 
+
+    @instrumented
     def process(self) -> None:
-        api_url = "https://images-api.nasa.gov/search"
         query = self.parameter_values.get("query")
         year_start = self.parameter_values.get("year_start")
         year_end = self.parameter_values.get("year_end")
+        result_index = self.parameter_values.get("result_index") or 0
+        result_count = min(max(1, self.parameter_values.get("result_count") or 1), MAX_RESULT_COUNT)
+        use_cache = self.parameter_values.get("use_cache", True)
 
         # Clear previous outputs/errors
         self.parameter_output_values["image_url"] = None
@@ -103,82 +234,224 @@ class NasaImageSearchNode(ControlNode):
         self.parameter_output_values["image_description"] = None
         self.parameter_output_values["error_message"] = None
         self.parameter_output_values["image"] = None
+        for name in ("images", "image_titles", "image_descriptions", "image_urls", "errors"):
+            self.parameter_output_values[name] = []
 
         if not query:
             self.parameter_output_values["error_message"] = "Error: Query parameter is required."
             # Consider raising an exception or handling this differently based on desired flow control
             return
 
+        parameter_error = self._parameter_error()
+        if parameter_error:
+            self.parameter_output_values["error_message"] = f"Error: {parameter_error}"
+            return
+
+        try:
+            settings = transcode_settings(
+                self.parameter_values.get("max_dimension"),
+                self.parameter_values.get("output_format"),
+                self.parameter_values.get("quality"),
+            )
+        except ValueError as e:
+            self.parameter_output_values["error_message"] = f"Error: {e}"
+            return
+
+        # Both requests go through the library's shared session, so connections are reused across runs
+        session = get_session()
+        try:
+            items = self._search_results(session, query, year_start, year_end, result_index, result_count, use_cache)
+
+            if not items:
+                if result_index:
+                    self.parameter_output_values["error_message"] = f"No image found at result_index {result_index} for the given query."
+                else:
+                    self.parameter_output_values["error_message"] = "No image found for the given query."
+                return
+
+            # The single-result outputs always describe the first match
+            item = items[0]
+            self.parameter_output_values["image_url"] = item["image_url"]
+            self.parameter_output_values["image_title"] = item["title"]
+            self.parameter_output_values["image_description"] = item["description"]
+            self.parameter_output_values["image_titles"] = [item["title"] for item in items]
+            self.parameter_output_values["image_descriptions"] = [item["description"] for item in items]
+            self.parameter_output_values["image_urls"] = [item["image_url"] for item in items]
+
+            # Now, download the actual images and create ImageArtifacts
+            images, errors = self._fetch_images(session, items, use_cache, settings)
+            self.parameter_output_values["image"] = images[0]
+            self.parameter_output_values["images"] = images
+            self.parameter_output_values["errors"] = errors
+            if len(items) == 1:
+                self.parameter_output_values["error_message"] = errors[0]
+            elif any(errors):
+                failed = sum(1 for error in errors if error)
+                self.parameter_output_values["error_message"] = f"{failed} of {len(items)} images could not be retrieved. See errors for details."
+
+        except requests.exceptions.RequestException as e:
+            self.parameter_output_values["error_message"] = f"API Request Error: {e}"
+        except Exception as e:
+            # Catch any other unexpected errors during processing
+            self.parameter_output_values["error_message"] = f"An unexpected error occurred: {e}"
+
+
+    def _search_results(self, session: "requests.Session", query: str, year_start: str | None, year_end: str | None, start: int, count: int, use_cache: bool) -> list[dict]:
+        # Collect count items from start onward, walking as many search pages as needed.
+        results = []
+        index = start
+        while len(results) < count:
+            page, offset = divmod(index, SEARCH_PAGE_SIZE)
+            page_items = self._search_page(session, query, year_start, year_end, page + 1, use_cache)
+            found = page_items[offset:offset + count - len(results)]
+            results.extend(found)
+            if not found or len(page_items) < SEARCH_PAGE_SIZE:
+                break
+            index += len(found)
+        return results
+
+
+    def _fetch_images(self, session: "requests.Session", items: list[dict], use_cache: bool, settings: TranscodeSettings | None) -> tuple[list, list]:
+        # Returns an ImageArtifact (or None) and an error message (or None) for every item, in order.
+        def fetch(item: dict) -> "tuple[artifacts.ImageArtifact | None, str | None]":
+            if not item["image_url"]:
+                return None, "Found result, but no preview image URL available."
+            try:
+                image_name = (item["title"] or "nasa_image").replace(" ", "_")
+                return self._fetch_image(session, item["image_url"], image_name, use_cache, settings), None
+            except Exception as img_err:
+                return None, f"Error downloading image: {img_err}"
+
+        if len(items) == 1:
+            results = [fetch(items[0])]
+        else:
+            # Downloads are network bound, so a small thread pool makes the total close to the slowest single download.
+            with ThreadPoolExecutor(max_workers=min(len(items), MAX_DOWNLOAD_WORKERS)) as pool:
+                results = list(pool.map(propagate_run(fetch), items))
+        return [image for image, _ in results], [error for _, error in results]
+
+
+    def _search_page(self, session: "requests.Session", query: str, year_start: str | None, year_end: str | None, page: int, use_cache: bool) -> list[dict]:
+        # Queries differing only in case or spacing share a cache entry.
+        normalized_query = " ".join(query.split())
+        cache_key = f"{normalized_query.lower()}|{year_start or ''}|{year_end or ''}|{page}|{SEARCH_PAGE_SIZE}"
+        cache = get_search_cache() if use_cache else None
+        if cache is not None:
+            items = cache.get(cache_key)
+            if items is not None:
+                return items
+
         params = {
-            "q": query,
+            "q": normalized_query,
             "media_type": "image", # Fixed to image
-            "page_size": 1 # We only need the first result for now
+            "page": page,
+            "page_size": SEARCH_PAGE_SIZE,
         }
         if year_start:
             params["year_start"] = year_start
         if year_end:
             params["year_end"] = year_end
 
-        try:
-            response = requests.get(api_url, params=params, timeout=10) # Added timeout
-            response.raise_for_status() # Raises HTTPError for bad responses (4xx or 5xx)
+        response = session.get(NASA_API_URL, params=params, timeout=10) # Added timeout
+        response.raise_for_status() # Raises HTTPError for bad responses (4xx or 5xx)
+
+        # Keep only what the node outputs, so cached pages stay small.
+        items = []
+        for raw_item in response.json().get("collection", {}).get("items", []):
+            item_data = raw_item.get("data", [{}])[0]
+            item_links = raw_item.get("links", [])
+            # Find the preview image URL
+            image_url = next((link["href"] for link in item_links if link.get("rel") == "preview" and link.get("render") == "image"), None)
+            items.append({"title": item_data.get("title"), "description": item_data.get("description"), "image_url": image_url})
 
-            data = response.json()
-            items = data.get("collection", {}).get("items", [])
+        if cache is not None:
+            cache.set(cache_key, items)
+        return items
 
-            if not items:
-                self.parameter_output_values["error_message"] = "No image found for the given query."
-                return
 
-            # Extract data from the first item
-            first_item = items[0]
-            item_data = first_item.get("data", [{}])[0]
-            item_links = first_item.get("links", [])
+    def _fetch_image(self, session: "requests.Session", image_url: str, image_name: str, use_cache: bool, settings: TranscodeSettings | None) -> "artifacts.ImageArtifact":
+        if settings is None:
+            return self._fetch_original(session, image_url, image_name, use_cache)
 
-            # Find the preview image URL
-            image_url = next((link["href"] for link in item_links if link.get("rel") == "preview" and link.get("render") == "image"), None)
+        # Processed images are cached under their own key, so a hit skips both the download and the transcode.
+        cache = get_image_cache() if use_cache else None
+        cache_key = image_url + settings.cache_suffix
+        entry = cache.get(cache_key) if cache else None
+        if entry is not None and cache.is_fresh(entry):
+            return self._artifact_from_cache(cache, entry, image_name)
 
-            if not image_url:
-                 self.parameter_output_values["error_message"] = "Found result, but no preview image URL available."
-                 return
+        original = self._fetch_original(session, image_url, image_name, use_cache)
+        # Runs in the download thread: with several results those are already off the engine thread and in parallel
+        image_bytes, image_format, width, height = transcode_image(original.value, settings)
+        if cache is not None:
+            cache.put(cache_key, image_bytes, format=image_format, width=width, height=height)
+        return artifacts.ImageArtifact(
+            value=image_bytes,
+            format=image_format,
+            name=image_name,
+            width=width,
+            height=height
+        )
 
-            self.parameter_output_values["image_url"] = image_url
-            self.parameter_output_values["image_title"] = item_data.get("title")
-            self.parameter_output_values["image_description"] = item_data.get("description")
+    def _fetch_original(self, session: "requests.Session", image_url: str, image_name: str, use_cache: bool) -> "artifacts.ImageArtifact":
+        cache = get_image_cache() if use_cache else None
+        entry = cache.get(image_url) if cache else None
+        # A fresh cache hit already knows the format and dimensions, so there's no request and no decode.
+        if entry is not None and cache.is_fresh(entry):
+            return self._artifact_from_cache(cache, entry, image_name)
 
-            # Now, download the actual image and create an ImageArtifact
-            try:
-                # Setting a User-Agent can help avoid blocks from some servers
-                headers = {'User-Agent': 'GriptapeNodes-NasaImageSearchNode/1.0'}
-                img_response = requests.get(image_url, stream=True, timeout=15, headers=headers)
-                img_response.raise_for_status()
-
-                image_bytes = img_response.content
-                # Get content type and format
-                content_type = img_response.headers.get('Content-Type', '')
-                image_format = content_type.split('/')[-1].split(';')[0].strip()
-                image_name = item_data.get("title", "nasa_image").replace(" ", "_")
-
-                # Use Pillow to get dimensions
-                with Image.open(BytesIO(image_bytes)) as img:
-                    width, height = img.size
-
-                # Create the ImageArtifact
-                image_artifact = ImageArtifact(
-                    value=image_bytes,
-                    format=image_format,
-                    name=image_name,
-                    width=width,
-                    height=height
-                )
-
-                self.parameter_output_values["image"] = image_artifact
-            
-            except Exception as img_err:
-                self.parameter_output_values["error_message"] = f"Error downloading image: {img_err}"
+        # Setting a User-Agent can help avoid blocks from some servers
+        headers = {'User-Agent': 'GriptapeNodes-NasaImageSearchNode/1.0'}
+        if entry is not None:
+            headers.update(cache.validators(entry))
+        img_response = session.get(image_url, stream=True, timeout=15, headers=headers)
+        if entry is not None and img_response.status_code == 304:
+            img_response.close()
+            return self._artifact_from_cache(cache, cache.revalidated(entry), image_name)
+        img_response.raise_for_status()
 
-        except requests.exceptions.RequestException as e:
-            self.parameter_output_values["error_message"] = f"API Request Error: {e}"
-        except Exception as e:
-            # Catch any other unexpected errors during processing
-            self.parameter_output_values["error_message"] = f"An unexpected error occurred: {e}" 
\ No newline at end of file
+        # Get content type and format
+        content_type = img_response.headers.get('Content-Type', '')
+        image_format = content_type.split('/')[-1].split(';')[0].strip()
+
+        # Stream the body into a bounded buffer instead of holding img_response.content plus a BytesIO copy
+        max_image_mb = self.parameter_values.get("max_image_mb")
+        max_bytes = int((DEFAULT_MAX_IMAGE_MB if max_image_mb is None else max_image_mb) * 1024 * 1024)
+        with download_to_buffer(img_response, max_bytes) as buffer:
+            # Pillow only parses the header here; pixels are never decoded
+            with Image.open(buffer) as img:
+                width, height = img.size
+                image_format = image_format or (img.format or "").lower()
+            # Reading an exact size allocates the bytes once; read() with no size grows and joins a list of chunks
+            size = buffer.seek(0, os.SEEK_END)
+            buffer.seek(0)
+            image_bytes = buffer.read(size)
+
+        if cache is not None:
+            cache.put(
+                image_url,
+                image_bytes,
+                format=image_format,
+                width=width,
+                height=height,
+                etag=img_response.headers.get('ETag'),
+                last_modified=img_response.headers.get('Last-Modified'),
+            )
+
+        # Create the ImageArtifact
+        return artifacts.ImageArtifact(
+            value=image_bytes,
+            format=image_format,
+            name=image_name,
+            width=width,
+            height=height
+        )
+
+    def _artifact_from_cache(self, cache, entry: CachedImage, image_name: str) -> "artifacts.ImageArtifact":
+        return artifacts.ImageArtifact(
+            value=cache.read(entry),
+            format=entry.format,
+            name=image_name,
+            width=entry.width,
+            height=entry.height
+        )
@@ -1,36 +1,106 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from griptape_nodes.exe_types.node_types import ControlNode
-from griptape_nodes.exe_types.core_types import Parameter, ParameterMode
-import openai
-from griptape.structures import Agent
-from griptape.utils import Stream
-from griptape.events import TextChunkEvent
+from griptape_nodes.exe_types.core_types import ParameterMode
+from instrumentation import instrumented, propagate_run
+from lazy_imports import lazy_import
+from parameter_specs import ParameterSpec, add_parameters
+from openai_client import DEFAULT_MODEL, RateLimiter, driver_settings, estimate_tokens, non_retryable_errors, prompt_driver, validate_api_key
+from response_cache import get_response_cache, response_key
+
+# griptape's structures pull in most of the framework, so they're imported on the first run instead of at registration
+structures = lazy_import("griptape.structures")
+griptape_utils = lazy_import("griptape.utils")
+events = lazy_import("griptape.events")
+artifacts = lazy_import("griptape.artifacts")
+
+# How often streamed text is pushed to the output parameter, in seconds
+DEFAULT_FLUSH_INTERVAL = 0.1
 
 class OpenAIChat(ControlNode):
+    PARAMETERS = (
+        ParameterSpec(
+            name="prompt",
+            input_types=["str"],
+            type="str",
+            default_value = "Hey! What's up?",
+            tooltip="The prompt to call an agent",
+            allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
+            ui_options={"multiline":True}
+        ),
+        ParameterSpec(
+            name="model",
+            input_types=["str"],
+            type="str",
+            default_value=DEFAULT_MODEL,
+            tooltip="The OpenAI chat model to use",
+            allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
+        ),
+        ParameterSpec(
+            name="output",
+            output_type="str",
+            tooltip="The output from the agent",
+            allowed_modes={ParameterMode.OUTPUT},
+            ui_options={"multiline":True,"placeholder_text":"The agent response"}
+        ),
+        ParameterSpec(
+            name="flush interval",
+            input_types=["float"],
+            type="float",
+            default_value=DEFAULT_FLUSH_INTERVAL,
+            tooltip="Seconds between updates of the output while the response streams in. 0 updates on every chunk.",
+            allowed_modes={ParameterMode.PROPERTY},
+        ),
+        ParameterSpec(
+            name="use cache",
+            input_types=["bool"],
+            type="bool",
+            default_value=False,
+            tooltip="Return a stored response when the same prompt, model and settings were run before, without calling the API.",
+            allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
+        ),
+        ParameterSpec(
+            name="refresh cache",
+            input_types=["bool"],
+            type="bool",
+            default_value=False,
+            tooltip="Ignore any stored response, call the API, and store the new response.",
+            allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
+        ),
+        ParameterSpec(
+            name="cache hit",
+            output_type="bool",
+            tooltip="Whether the output came from the response cache",
+            allowed_modes={ParameterMode.OUTPUT},
+        ),
+        # Streaming metrics, so response latency can be watched from the flow
+        ParameterSpec(
+            name="time to first token",
+            output_type="float",
+            tooltip="Seconds from sending the prompt to receiving the first streamed chunk",
+            allowed_modes={ParameterMode.OUTPUT},
+        ),
+        ParameterSpec(
+            name="tokens per second",
+            output_type="float",
+            tooltip="Streamed chunks per second after the first one. OpenAI streams roughly one token per chunk.",
+            allowed_modes={ParameterMode.OUTPUT},
+        ),
+        ParameterSpec(
+            name="total latency",
+            output_type="float",
+            tooltip="Seconds from sending the prompt to the end of the response",
+            allowed_modes={ParameterMode.OUTPUT},
+        ),
+    )
+
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
 
         self.category = "ControlNodes"
         self.description = "An example node with dependencies"
-        self.add_parameter(
-            Parameter(
-                name="prompt",
-                input_types=["str"],
-                type="str",
-                default_value = "Hey! What's up?",
-                tooltip="The prompt to call an agent",
-                allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
-                ui_options={"multiline":True}
-            )
-        )
-        self.add_parameter(
-            Parameter(
-                name="output",
-                output_type="str",
-                tooltip="The output from the agent",
-                allowed_modes={ParameterMode.OUTPUT},
-                ui_options={"multiline":True,"placeholder_text":"The agent response"}
-            )
-        )
+        add_parameters(self, self.PARAMETERS)
 
     # This node makes a call to OpenAI, so it has a dependency. We have to define that method to properly catch it.
     def validate_node(self) -> list[Exception] | None:
@@ -42,24 +112,216 @@ class OpenAIChat(ControlNode):
             # Add any exceptions to your list to return
             exceptions.append(e)
             return exceptions
-        try:
-            client = openai.OpenAI(api_key=api_key)
-            client.models.list()
-        except Exception as e:
-            exceptions.append(e)
+        # Results are cached per API key, so many chat nodes sharing a key only check it once.
+        error = validate_api_key(api_key)
+        if error is not None:
+            exceptions.append(error)
         # if there are exceptions, they will display when the user tries to run the flow with the node.
         return exceptions if exceptions else None
 
 
+    @instrumented
     def process(self) -> None:
         # All of the current values of a parameter are stored on self.parameter_values
         prompt = self.parameter_values["prompt"]
-        # Use a griptape agent to run the structure! 
-        agent = Agent(stream=True)
-        full_output = ""
+        model = self.parameter_values.get("model") or DEFAULT_MODEL
+        api_key = self.get_config_value(service="OpenAI", value="OPENAI_API_KEY")
+        # Use a griptape agent to run the structure! The driver reuses the client shared with validate_node.
+        driver = prompt_driver(api_key, model)
+        start = time.perf_counter()
+
+        cache = get_response_cache() if self.parameter_values.get("use cache") else None
+        if cache is not None:
+            cache_key = response_key(prompt, model, driver_settings(driver))
+            cached = None if self.parameter_values.get("refresh cache") else cache.get(cache_key)
+            if cached is not None:
+                self.parameter_output_values["output"] = cached
+                self.parameter_output_values["cache hit"] = True
+                self.parameter_output_values["total latency"] = time.perf_counter() - start
+                self.parameter_output_values["time to first token"] = self.parameter_output_values["total latency"]
+                self.parameter_output_values["tokens per second"] = None
+                return
+        self.parameter_output_values["cache hit"] = False
+
+        agent = structures.Agent(prompt_driver=driver)
+        flush_interval = self.parameter_values.get("flush interval", DEFAULT_FLUSH_INTERVAL) or 0
+
+        # Chunks are collected in a list and joined once, instead of growing a string on every chunk.
+        # Only the text received since the last flush is appended to the output, so the UI fills in as it streams.
+        chunks = []
+        flushed = 0
+        token_count = 0
+        first_token_at = None
+        self.parameter_output_values["output"] = ""
+        last_flush = start
         # Running with the Stream Util allows you to stream your responses to the node!
-        for artifact in Stream(agent, event_types=[TextChunkEvent]).run(prompt):
-            full_output += artifact.value
-        self.parameter_output_values["output"] = full_output
-       
-        
+        for artifact in griptape_utils.Stream(agent, event_types=[events.TextChunkEvent]).run(prompt):
+            now = time.perf_counter()
+            if first_token_at is None:
+                first_token_at = now
+            chunks.append(artifact.value)
+            token_count += 1
+            if now - last_flush >= flush_interval:
+                self.append_value_to_parameter("output", "".join(chunks[flushed:]))
+                flushed = len(chunks)
+                last_flush = now
+        if flushed < len(chunks):
+            self.append_value_to_parameter("output", "".join(chunks[flushed:]))
+        end = time.perf_counter()
+
+        # Agents report failures as an ErrorArtifact rather than raising, so the error is raised here instead of
+        # finishing with whatever partial text streamed in (and caching it)
+        if isinstance(agent.output, artifacts.ErrorArtifact):
+            raise RuntimeError(agent.output.value) from agent.output.exception
+        self.parameter_output_values["output"] = "".join(chunks)
+        if cache is not None and self.parameter_output_values["output"]:
+            cache.set(cache_key, self.parameter_output_values["output"])
+        self.parameter_output_values["total latency"] = end - start
+        self.parameter_output_values["time to first token"] = first_token_at - start if first_token_at is not None else None
+        generation_time = end - first_token_at if first_token_at is not None else 0
+        self.parameter_output_values["tokens per second"] = (token_count - 1) / generation_time if token_count > 1 and generation_time > 0 else None
+
+
+# Runs a list of prompts concurrently. Each worker thread reuses one Agent, and all of them share a single driver and client.
+class OpenAIChatBatch(ControlNode):
+    PARAMETERS = (
+        ParameterSpec(
+            name="prompts",
+            input_types=["list"],
+            type="list",
+            tooltip="The prompts to run. Each one is sent on its own, without shared conversation history.",
+            allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
+        ),
+        ParameterSpec(
+            name="model",
+            input_types=["str"],
+            type="str",
+            default_value=DEFAULT_MODEL,
+            tooltip="The OpenAI chat model to use",
+            allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
+        ),
+        ParameterSpec(
+            name="max workers",
+            input_types=["int"],
+            type="int",
+            default_value=8,
+            tooltip="How many prompts run at the same time",
+            allowed_modes={ParameterMode.PROPERTY},
+        ),
+        ParameterSpec(
+            name="requests per minute",
+            input_types=["int"],
+            type="int",
+            default_value=0,
+            tooltip="Client-side request rate limit. 0 means unlimited.",
+            allowed_modes={ParameterMode.PROPERTY},
+        ),
+        ParameterSpec(
+            name="tokens per minute",
+            input_types=["int"],
+            type="int",
+            default_value=0,
+            tooltip="Client-side token rate limit, using an estimate of ~4 characters per token. 0 means unlimited.",
+            allowed_modes={ParameterMode.PROPERTY},
+        ),
+        ParameterSpec(
+            name="max retries",
+            input_types=["int"],
+            type="int",
+            default_value=2,
+            tooltip="How many times a failed prompt is retried, with exponential backoff, before its error is reported",
+            allowed_modes={ParameterMode.PROPERTY},
+        ),
+        ParameterSpec(
+            name="use cache",
+            input_types=["bool"],
+            type="bool",
+            default_value=False,
+            tooltip="Return stored responses for prompts that were run before with the same model and settings.",
+            allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
+        ),
+        ParameterSpec(
+            name="outputs",
+            output_type="list",
+            tooltip="One response per prompt, in input order. None where the prompt failed.",
+            allowed_modes={ParameterMode.OUTPUT},
+        ),
+        ParameterSpec(
+            name="errors",
+            output_type="list",
+            tooltip="One error message per prompt, in input order. None where the prompt succeeded.",
+            allowed_modes={ParameterMode.OUTPUT},
+        ),
+    )
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+
+        self.category = "ControlNodes"
+        self.description = "Run many prompts concurrently"
+        add_parameters(self, self.PARAMETERS)
+
+    def validate_node(self) -> list[Exception] | None:
+        # Same check as OpenAIChat, and it shares the same per-key cache.
+        try:
+            api_key = self.get_config_value(service="OpenAI", value="OPENAI_API_KEY")
+        except Exception as e:
+            return [e]
+        error = validate_api_key(api_key)
+        return [error] if error is not None else None
+
+
+    @instrumented
+    def process(self) -> None:
+        prompts = list(self.parameter_values.get("prompts") or [])
+        model = self.parameter_values.get("model") or DEFAULT_MODEL
+        max_workers = max(1, self.parameter_values.get("max workers") or 1)
+        max_retries = max(0, self.parameter_values.get("max retries") or 0)
+        api_key = self.get_config_value(service="OpenAI", value="OPENAI_API_KEY")
+
+        # Whole responses are needed, so the driver doesn't stream. Retries are left to the loop below, so that
+        # every request goes through the rate limiter.
+        driver = prompt_driver(api_key, model, stream=False, retry=False)
+        limiter = RateLimiter(
+            requests_per_minute=self.parameter_values.get("requests per minute") or 0,
+            tokens_per_minute=self.parameter_values.get("tokens per minute") or 0,
+        )
+        cache = get_response_cache() if self.parameter_values.get("use cache") else None
+        settings = driver_settings(driver)
+        # Agents keep per-run task state, so each worker thread gets its own; conversation memory is off so prompts stay independent.
+        agents = threading.local()
+
+        def run(prompt: str) -> tuple[str | None, str | None]:
+            cache_key = response_key(prompt, model, settings) if cache is not None else None
+            if cache is not None:
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    return cached, None
+            if not hasattr(agents, "agent"):
+                agents.agent = structures.Agent(prompt_driver=driver, conversation_memory=None)
+            error = None
+            for attempt in range(max_retries + 1):
+                if attempt:
+                    time.sleep(0.5 * 2 ** (attempt - 1))
+                limiter.acquire(estimate_tokens(prompt))
+                try:
+                    output = agents.agent.run(prompt).output
+                except Exception as e:
+                    error = str(e)
+                    continue
+                # Agents report failures as an ErrorArtifact rather than raising
+                if isinstance(output, artifacts.ErrorArtifact):
+                    error = output.value
+                    if isinstance(output.exception, non_retryable_errors()):
+                        break
+                    continue
+                limiter.consume(estimate_tokens(output.value))
+                if cache is not None:
+                    cache.set(cache_key, output.value)
+                return output.value, None
+            return None, error
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts)) or 1) as pool:
+            results = list(pool.map(propagate_run(run), prompts))
+        self.parameter_output_values["outputs"] = [output for output, _ in results]
+        self.parameter_output_values["errors"] = [error for _, error in results]
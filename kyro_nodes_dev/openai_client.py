@@ -0,0 +1,182 @@
+"""Shared OpenAI clients and cached API key validation for the OpenAI nodes.
+
+One openai.OpenAI client is kept per API key, so validation and every run reuse the same pooled HTTP connections.
+Validation results are cached per key for VALIDATION_TTL seconds, so a flow with many chat nodes checks its key
+with one models.list() call instead of one per node per run. Keys are only held in memory and cached by hash.
+A node with no key configured falls back to OPENAI_API_KEY in the environment, as a default client would.
+"""
+import hashlib
+import os
+import threading
+import time
+
+from instrumentation import record_external_call
+from lazy_imports import lazy_import
+from ttl_cache import TTLCache
+
+# Deferred until the first client or driver is built, so registering the library doesn't import the SDK.
+openai = lazy_import("openai")
+openai_drivers = lazy_import("griptape.drivers.prompt.openai")
+
+DEFAULT_MODEL = "gpt-4o"
+VALIDATION_TTL = 15 * 60
+API_KEY_ENV = "OPENAI_API_KEY"
+
+
+# Entries are 1-tuples holding None for a valid key or the exception that rejected it.
+validation_cache = TTLCache(ttl=VALIDATION_TTL)
+
+_clients: dict[str, "openai.OpenAI"] = {}
+_validation_locks: dict[str, threading.Lock] = {}
+_lock = threading.Lock()
+
+
+def _key_id(api_key:str) -> str:
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+def resolve_api_key(api_key:str | None) -> str:
+    # The configured key, or the environment's when none is set. Raises the SDK's own error when neither exists.
+    api_key = api_key or os.environ.get(API_KEY_ENV)
+    if not api_key:
+        raise openai.OpenAIError(f"Missing credentials. Set {API_KEY_ENV} in the OpenAI settings or in the environment.")
+    return api_key
+
+
+def get_client(api_key:str | None) -> "openai.OpenAI":
+    # The client picks up OPENAI_BASE_URL from the environment, like a default client would.
+    api_key = resolve_api_key(api_key)
+    key_id = _key_id(api_key)
+    client = _clients.get(key_id)
+    if client is None:
+        with _lock:
+            client = _clients.get(key_id)
+            if client is None:
+                # The event hook counts every API request towards the node run that made it
+                http_client = openai.DefaultHttpxClient(event_hooks={"request": [_count_request]})
+                client = _clients[key_id] = openai.OpenAI(api_key=api_key, http_client=http_client)
+    return client
+
+
+def close_clients() -> None:
+    # Closes every shared client and forgets validation results. The next call builds fresh clients.
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        _validation_locks.clear()
+    validation_cache.clear()
+    for client in clients:
+        client.close()
+
+
+def _count_request(request) -> None:
+    record_external_call("openai")
+
+
+def validate_api_key(api_key:str | None) -> Exception | None:
+    # Returns None if the key works, or the exception explaining why it doesn't.
+    try:
+        api_key = resolve_api_key(api_key)
+    except openai.OpenAIError as e:
+        return e
+    key_id = _key_id(api_key)
+    with _lock:
+        key_lock = _validation_locks.setdefault(key_id, threading.Lock())
+    # Nodes validating the same key at once wait for the first check instead of all calling the API.
+    with key_lock:
+        cached = validation_cache.get(key_id)
+        if cached is not None:
+            return cached[0]
+        try:
+            get_client(api_key).models.list()
+            error = None
+        except (openai.AuthenticationError, openai.PermissionDeniedError) as e:
+            # A rejected key stays rejected, so that answer is cached too
+            error = e
+        except Exception as e:
+            # Network trouble or rate limits may clear up; check again next time
+            return e
+        validation_cache.set(key_id, (error,))
+        return error
+
+
+def non_retryable_errors() -> tuple[type[Exception], ...]:
+    # Errors that will fail the same way on every attempt, so batch runs don't retry them
+    return (openai.AuthenticationError, openai.PermissionDeniedError, openai.BadRequestError, openai.NotFoundError)
+
+
+def prompt_driver(api_key:str | None, model:str=DEFAULT_MODEL, stream:bool=True, retry:bool=True) -> "openai_drivers.OpenAiChatPromptDriver":
+    api_key = resolve_api_key(api_key)
+    # With retry=False the driver and the client each make a single attempt, for callers that retry themselves
+    if not retry:
+        client = get_client(api_key).with_options(max_retries=0)
+        return openai_drivers.OpenAiChatPromptDriver(model=model, api_key=api_key, client=client, stream=stream, max_attempts=1)
+    return openai_drivers.OpenAiChatPromptDriver(model=model, api_key=api_key, client=get_client(api_key), stream=stream)
+
+
+def driver_settings(driver:"openai_drivers.OpenAiChatPromptDriver") -> dict:
+    # Everything besides the prompt and model that changes what the API returns, used to key cached responses
+    return {
+        "base_url": str(driver.client.base_url),
+        "temperature": driver.temperature,
+        "max_tokens": driver.max_tokens,
+        "seed": driver.seed,
+        "response_format": driver.response_format,
+    }
+
+
+def estimate_tokens(text:str) -> int:
+    # OpenAI's rule of thumb of ~4 characters per token. Good enough for client-side rate limiting,
+    # and it doesn't need tiktoken's encoding files.
+    return len(text) // 4 + 1
+
+
+class RateLimiter:
+    """Client-side token buckets for requests per minute and tokens per minute. A limit of 0 disables it.
+
+    Each bucket holds up to one minute's allowance and refills continuously, so short bursts are allowed
+    while the average stays under the limit.
+    """
+
+    def __init__(self, requests_per_minute:int=0, tokens_per_minute:int=0) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens:int=0) -> None:
+        # Blocks until one request and `tokens` tokens are available, then takes them.
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+        while True:
+            with self._lock:
+                self._refill()
+                request_wait = self._wait(self._requests, 1, self.requests_per_minute)
+                token_wait = self._wait(self._tokens, tokens, self.tokens_per_minute)
+                if request_wait == 0 and token_wait == 0:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+            time.sleep(max(request_wait, token_wait))
+
+    def consume(self, tokens:int) -> None:
+        # Charges tokens after the fact, e.g. for the response. The bucket may go negative, which delays later requests.
+        if self.tokens_per_minute:
+            with self._lock:
+                self._refill()
+                self._tokens -= tokens
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    @staticmethod
+    def _wait(available:float, needed:float, per_minute:int) -> float:
+        if not per_minute or available >= needed:
+            return 0
+        return (needed - available) * 60 / per_minute
@@ -0,0 +1,93 @@
+"""Parameter definitions declared once per node class.
+
+Node classes list their parameters as a PARAMETERS tuple of ParameterSpec, built once when the module is imported,
+and __init__ turns each spec into a Parameter with add_parameters(). Each class's parameters are declared in one
+place instead of being assembled from literals inside __init__.
+
+Specs are frozen and shared by every instance of the class. What a Parameter owns and may change is made per
+instance: the allowed_modes set, which the engine edits in place when a parameter is altered, the ui_options dict,
+which Parameter keeps by reference, and traits, which become children of a single parameter and so are declared as
+factories (e.g. functools.partial(MinMax, ...)). Parameter copies input_types in its own setter and never modifies
+converters, so those are shared as-is.
+
+A ui_options dict is copied along with the dicts and lists nested in it, like Age's slider, which is far cheaper
+than a deep copy. Options nested deeper than that, or that aren't a dict (a ParameterUIOptions, say), are declared
+as a factory like traits are.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+from griptape_nodes.exe_types.core_types import Parameter, ParameterMode
+
+
+@dataclass(frozen=True, slots=True)
+class ParameterSpec:
+    name: str
+    tooltip: str
+    type: str | None = None
+    input_types: tuple[str, ...] | None = None
+    output_type: str | None = None
+    default_value: Any = None
+    # None allows every mode, like Parameter's own default
+    allowed_modes: frozenset[ParameterMode] | None = None
+    converters: tuple[Callable[[Any], Any], ...] = ()
+    # Called once per Parameter; each returns a new trait instance
+    traits: tuple[Callable[[], Any], ...] = ()
+    # A dict, or a factory that returns new options for each Parameter
+    ui_options: dict | Callable[[], Any] | None = None
+    # The Parameter arguments every instance shares, assembled once
+    _shared: dict = field(init=False, repr=False, compare=False)
+    # Keys of ui_options holding a dict or list, which each Parameter needs a copy of
+    _nested_ui_options: tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Declarations may use lists and sets like Parameter(...) calls do; store immutable copies
+        if self.input_types is not None:
+            object.__setattr__(self, "input_types", tuple(self.input_types))
+        if self.allowed_modes is not None:
+            object.__setattr__(self, "allowed_modes", frozenset(self.allowed_modes))
+        object.__setattr__(self, "converters", tuple(self.converters))
+        object.__setattr__(self, "traits", tuple(self.traits))
+        object.__setattr__(self, "_nested_ui_options", _nested_options(self.name, self.ui_options))
+        object.__setattr__(self, "_shared", {
+            "name": self.name,
+            "tooltip": self.tooltip,
+            "type": self.type,
+            "input_types": self.input_types,
+            "output_type": self.output_type,
+            "default_value": self.default_value,
+        })
+
+    def build(self) -> Parameter:
+        ui_options = self.ui_options
+        if callable(ui_options):
+            ui_options = ui_options()
+        elif ui_options is not None:
+            ui_options = ui_options.copy()
+            for key in self._nested_ui_options:
+                ui_options[key] = ui_options[key].copy()
+        return Parameter(
+            **self._shared,
+            allowed_modes=set(self.allowed_modes) if self.allowed_modes is not None else None,
+            ui_options=ui_options,
+            converters=list(self.converters) if self.converters else None,
+            traits={make_trait() for make_trait in self.traits} if self.traits else None,
+        )
+
+
+def _nested_options(name:str, ui_options:Any) -> tuple[str, ...]:
+    if ui_options is None or callable(ui_options):
+        return ()
+    if not isinstance(ui_options, dict):
+        raise TypeError(f"ui_options of {name!r} must be a dict or a factory, got {type(ui_options).__name__}")
+    nested = tuple(key for key, value in ui_options.items() if isinstance(value, (dict, list)))
+    for key in nested:
+        values = ui_options[key].values() if isinstance(ui_options[key], dict) else ui_options[key]
+        if any(isinstance(value, (dict, list)) for value in values):
+            raise TypeError(f"ui_options of {name!r} nest too deep to copy cheaply; declare them as a factory instead")
+    return nested
+
+
+def add_parameters(node, specs:Iterable[ParameterSpec]) -> None:
+    for spec in specs:
+        node.add_parameter(spec.build())
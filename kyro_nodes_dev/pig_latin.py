@@ -1,102 +1,147 @@
-from re import S
-import re
-from typing import Any
 from griptape_nodes.exe_types.node_types import ControlNode
-from griptape_nodes.exe_types.core_types import Parameter, ParameterMode
+from griptape_nodes.exe_types.core_types import ParameterMode
+from instrumentation import instrumented
+from memoization import memoized
+from parameter_specs import ParameterSpec, add_parameters
+# The translation engine lives in its own module so process pool workers can import it by name.
+from pig_latin_engine import (
+    default_output_path,
+    pig_latin_file,
+    to_pig_latin,
+    to_pig_latin_parallel,
+    to_pig_latin_sharded,
+)
+
+# Recent translations kept for reuse across ConvertToPigLatin nodes, bounded by count and by total text size
+PIG_LATIN_MEMO_ENTRIES = 32
+PIG_LATIN_MEMO_BYTES = 64 * 1024 * 1024
 
 # Control Nodes import the ControlNode class.
 class ConvertToPigLatin(ControlNode):
+    PARAMETERS = (
+        ParameterSpec(
+            name="input",
+            input_types=["str"],
+            type="str",
+            output_type="str",
+            tooltip="Input string",
+            allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
+            ui_options={"placeholder_text":"Input text here","multiline":True}
+        ),
+        ParameterSpec(
+            name="pig latin",
+            output_type="str",
+            type="str",
+            tooltip="The last name of the user",
+            # Specifying allowed_modes determines how the parameter can be used. Can it receive inputs, send outputs, or be modified in the node?
+            allowed_modes={ParameterMode.OUTPUT},
+            ui_options={"placeholder_text":"Input text here", "multiline":True}
+        ),
+        # File mode streams the document from disk in chunks, so memory stays flat no matter how big the file is.
+        ParameterSpec(
+            name="input file",
+            input_types=["str"],
+            type="str",
+            tooltip="Path to a text file to convert. When set, the file is streamed instead of reading the input string.",
+            allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
+        ),
+        ParameterSpec(
+            name="output file",
+            input_types=["str"],
+            type="str",
+            output_type="str",
+            tooltip="Where to write the converted file. Defaults to the input file name with a .pig_latin suffix.",
+        ),
+        ParameterSpec(
+            name="workers",
+            input_types=["int"],
+            type="int",
+            default_value=1,
+            tooltip="Processes used to convert the input string. Values above 1 split the text at whitespace and convert the pieces in parallel.",
+            allowed_modes={ParameterMode.PROPERTY},
+        ),
+    )
+
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
 
         self.category = "ControlNodes"
         self.description = "Change to pig latin"
             
-        self.add_parameter(
-            Parameter(
-                name="input",
-                input_types=["str"],
-                type="str",
-                output_type="str",
-                tooltip="Input string",
-                allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
-                ui_options={"placeholder_text":"Input text here","multiline":True}
-            )
-        )
-        self.add_parameter(
-            Parameter(
-                name="pig latin",
-                output_type="str",
-                type="str",
-                tooltip="The last name of the user",
-                # Specifying allowed_modes determines how the parameter can be used. Can it receive inputs, send outputs, or be modified in the node?
-                allowed_modes={ParameterMode.OUTPUT},
-                ui_options={"placeholder_text":"Input text here", "multiline":True}
-            )
-        )
+        add_parameters(self, self.PARAMETERS)
 
 
+    # Outputs don't depend on the worker count. File mode always runs, since the file may have changed on disk.
+    @instrumented
+    @memoized(cache_size=PIG_LATIN_MEMO_ENTRIES, max_bytes=PIG_LATIN_MEMO_BYTES, ignore=("workers", "output file"), bypass=lambda node: bool(node.parameter_values.get("input file")))
     def process(self) -> None:
         # All of the current values of a parameter are stored on self.parameter_values (If they have an INPUT or PROPERTY)
+        input_file = self.parameter_values.get("input file")
+        if input_file:
+            output_file = self.parameter_values.get("output file") or default_output_path(input_file)
+            pig_latin_file(input_file, output_file)
+            self.parameter_output_values["output file"] = str(output_file)
+            # The translation is in the file; don't leave an earlier run's string output behind
+            self.parameter_output_values["pig latin"] = None
+            return
         input = self.parameter_values["input"]
-        pig_latin = to_pig_latin(input)
+        workers = self.parameter_values.get("workers") or 1
+        if workers > 1:
+            pig_latin = to_pig_latin_sharded(input, workers=workers)
+        else:
+            pig_latin = to_pig_latin(input)
         self.parameter_output_values["pig latin"] = pig_latin
         # The node is complete!
 
 
-def to_pig_latin(text:str) -> str:
-    if not text:
-        return ""
-    
-    words = text.split()
-    pig_latin_words = []
-    
-    for word in words:
-        # Skip punctuation-only "words"
-        if not re.search('[a-zA-Z]', word):
-            pig_latin_words.append(word)
-            continue
-        
-        # Find leading punctuation
-        leading_punct_match = re.match(r'^([^a-zA-Z]*)', word)
-        leading_punct = leading_punct_match.group(0) if leading_punct_match else ''
-        
-        # Find trailing punctuation
-        trailing_punct_match = re.search(r'([^a-zA-Z]*)$', word)
-        trailing_punct = trailing_punct_match.group(0) if trailing_punct_match else ''
-        
-        # Extract the actual word without punctuation
-        actual_word = word[len(leading_punct):len(word)-len(trailing_punct)]
-        if not actual_word:
-            pig_latin_words.append(word)
-            continue
-        
-        # Convert the word based on whether it starts with a vowel
-        first_char = actual_word[0].lower()
-        
-        if first_char in 'aeiou':
-            # Word starts with a vowel
-            pig_latin_word = actual_word + 'way'
-        else:
-            # Find the first vowel
-            vowel_match = re.search('[aeiou]', actual_word.lower())
-            
-            if not vowel_match:
-                # No vowels found, just add "ay"
-                pig_latin_word = actual_word + 'ay'
-            else:
-                # Move consonants before the first vowel to the end and add "ay"
-                first_vowel_index = vowel_match.start()
-                prefix = actual_word[:first_vowel_index]
-                suffix = actual_word[first_vowel_index:]
-                pig_latin_word = suffix + prefix + 'ay'
-        
-        # Preserve the case of the first letter
-        if actual_word[0].isupper():
-            pig_latin_word = pig_latin_word[0].upper() + pig_latin_word[1:].lower()
-        
-        # Reconstruct the word with punctuation
-        pig_latin_words.append(leading_punct + pig_latin_word + trailing_punct)
-    
-    # Join the words back together
-    return ' '.join(pig_latin_words)
+# Sibling node for corpora: converts a list of documents across a process pool.
+class ConvertToPigLatinBatch(ControlNode):
+    PARAMETERS = (
+        ParameterSpec(
+            name="inputs",
+            input_types=["list"],
+            type="list",
+            output_type="list",
+            tooltip="Documents to convert",
+            allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
+        ),
+        ParameterSpec(
+            name="workers",
+            input_types=["int"],
+            type="int",
+            default_value=0,
+            tooltip="Number of worker processes. 0 uses one per CPU core.",
+            allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
+        ),
+        ParameterSpec(
+            name="chunk size",
+            input_types=["int"],
+            type="int",
+            default_value=8,
+            tooltip="Documents sent to a worker at a time. Raise it for many small documents.",
+            allowed_modes={ParameterMode.INPUT, ParameterMode.PROPERTY},
+        ),
+        ParameterSpec(
+            name="pig latin",
+            output_type="list",
+            type="list",
+            tooltip="The converted documents, in the same order as the inputs",
+            allowed_modes={ParameterMode.OUTPUT},
+        ),
+    )
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+
+        self.category = "ControlNodes"
+        self.description = "Change a list of documents to pig latin in parallel"
+        add_parameters(self, self.PARAMETERS)
+
+
+    @instrumented
+    def process(self) -> None:
+        inputs = self.parameter_values.get("inputs") or []
+        workers = self.parameter_values.get("workers") or None
+        chunk_size = self.parameter_values.get("chunk size") or 1
+        self.parameter_output_values["pig latin"] = to_pig_latin_parallel(inputs, workers=workers, chunksize=chunk_size)
+
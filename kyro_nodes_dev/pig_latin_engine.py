@@ -0,0 +1,242 @@
+"""Pig latin translation engine used by the ConvertToPigLatin nodes.
+
+These functions live outside the node module on purpose: the engine loads node files under generated module names,
+and process pool workers can only unpickle functions from a module they can import by name.
+"""
+import atexit
+import os
+import re
+import threading
+import uuid
+from concurrent import futures
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+from lazy_imports import lazy_import
+
+multiprocessing = lazy_import("multiprocessing")
+
+# Patterns are compiled once at import instead of on every word.
+# Leading punctuation is everything before the first ASCII letter, and the core word runs through the last one.
+_LEADING_PUNCT = re.compile(r'[^a-zA-Z]*')
+_THROUGH_LAST_LETTER = re.compile(r'.*[a-zA-Z]', re.DOTALL)
+_VOWEL = re.compile('[aeiou]')
+
+# Natural text repeats the same words constantly, so translated words are cached.
+# The cache is bounded so a corpus full of unique tokens can't grow it forever.
+WORD_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def _translate_word(word:str) -> str:
+    # Skip punctuation-only "words"
+    start = _LEADING_PUNCT.match(word).end()
+    if start == len(word):
+        return word
+
+    end = _THROUGH_LAST_LETTER.match(word, start).end()
+    actual_word = word[start:end]
+    lowered = actual_word.lower()
+
+    # Convert the word based on whether it starts with a vowel
+    if lowered[0] in 'aeiou':
+        pig_latin_word = actual_word + 'way'
+    else:
+        vowel_match = _VOWEL.search(lowered)
+        if vowel_match is None:
+            # No vowels found, just add "ay"
+            pig_latin_word = actual_word + 'ay'
+        else:
+            # Move consonants before the first vowel to the end and add "ay"
+            first_vowel_index = vowel_match.start()
+            pig_latin_word = actual_word[first_vowel_index:] + actual_word[:first_vowel_index] + 'ay'
+
+    # Preserve the case of the first letter
+    if actual_word[0].isupper():
+        pig_latin_word = pig_latin_word[0].upper() + pig_latin_word[1:].lower()
+
+    # Reconstruct the word with punctuation
+    return word[:start] + pig_latin_word + word[end:]
+
+
+def to_pig_latin(text:str) -> str:
+    if not text:
+        return ""
+    # split() tokenizes the whole text in a single C-level pass; each word is then looked up in the cache.
+    return ' '.join(map(_translate_word, text.split()))
+
+
+def to_pig_latin_many(texts:Iterable[str]) -> list[str]:
+    # Batch entry point. Every text shares the same word cache, so vocabulary translated for one document is reused by the rest.
+    return [to_pig_latin(text) for text in texts]
+
+
+# Streaming translation. Output matches to_pig_latin on the concatenated chunks, but only one chunk is held at a time.
+STREAM_CHUNK_SIZE = 1 << 20
+
+
+def iter_pig_latin(chunks:Iterable[str]) -> Iterator[str]:
+    # A word can be split across a chunk boundary, so the tail of a chunk is held back until we see whitespace after it.
+    pending = []
+    separator = ''
+    for chunk in chunks:
+        if not chunk:
+            continue
+        words = chunk.split()
+        if not words:
+            # Whitespace-only chunk: whatever was pending is now a complete word.
+            if pending:
+                yield separator + _translate_word(''.join(pending))
+                separator = ' '
+                pending = []
+            continue
+        if pending:
+            if len(words) == 1 and words[0] == chunk:
+                # Still inside the same word
+                pending.append(chunk)
+                continue
+            if chunk[0].isspace():
+                words.insert(0, ''.join(pending))
+            else:
+                words[0] = ''.join(pending) + words[0]
+            pending = []
+        if not chunk[-1].isspace():
+            pending.append(words.pop())
+        if words:
+            yield separator + ' '.join(map(_translate_word, words))
+            separator = ' '
+    if pending:
+        yield separator + _translate_word(''.join(pending))
+
+
+def iter_pig_latin_file(path:str | os.PathLike, chunk_size:int=STREAM_CHUNK_SIZE, encoding:str="utf-8") -> Iterator[str]:
+    with open(path, encoding=encoding) as source:
+        yield from iter_pig_latin(iter(lambda: source.read(chunk_size), ''))
+
+
+def pig_latin_file(input_path:str | os.PathLike, output_path:str | os.PathLike, chunk_size:int=STREAM_CHUNK_SIZE, encoding:str="utf-8") -> None:
+    # Written to a temporary file next to the output and moved into place at the end, so an output path that is the
+    # input file (or a failed run) never truncates the document while it's still being read.
+    output_path = os.path.abspath(output_path)
+    temporary_path = os.path.join(os.path.dirname(output_path), f".{os.path.basename(output_path)}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(temporary_path, "x", encoding=encoding) as destination:
+            for piece in iter_pig_latin_file(input_path, chunk_size=chunk_size, encoding=encoding):
+                destination.write(piece)
+        os.replace(temporary_path, output_path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.unlink(temporary_path)
+        raise
+
+
+def default_output_path(input_path:str | os.PathLike) -> Path:
+    path = Path(input_path)
+    return path.with_name(f"{path.stem}.pig_latin{path.suffix}")
+
+
+# Parallel translation. Work is sharded across processes because translation is pure Python and bound by the GIL.
+SHARD_SIZE = 1 << 20
+_WHITESPACE = re.compile(r'\s')
+
+
+# The worker count the pool was built for, and the pool
+_pool: tuple[int | None, "futures.ProcessPoolExecutor"] | None = None
+# Runs currently using each pool. A replaced pool is shut down once its last run finishes.
+_pool_users: dict["futures.ProcessPoolExecutor", int] = {}
+_pool_lock = threading.Lock()
+
+
+def _current_pool(workers:int | None) -> "futures.ProcessPoolExecutor":
+    # Called with _pool_lock held
+    global _pool
+    if _pool is not None and _pool[0] == workers:
+        return _pool[1]
+    if _pool is not None and not _pool_users.get(_pool[1]):
+        _pool[1].shutdown(wait=False)
+    pool = futures.ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    _pool = (workers, pool)
+    return pool
+
+
+def get_process_pool(workers:int | None=None) -> "futures.ProcessPoolExecutor":
+    # One pool, created on first use and kept for later runs so workers only start once. Asking for a different worker
+    # count replaces it, so changing a node's workers setting never leaves idle processes behind.
+    # Workers are spawned, not forked: the engine process runs many threads, and forking it can deadlock the child.
+    with _pool_lock:
+        return _current_pool(workers)
+
+
+@contextmanager
+def _using_process_pool(workers:int | None) -> Iterator["futures.ProcessPoolExecutor"]:
+    # The current pool, kept running until the caller is done with it even if another run replaces it meanwhile
+    with _pool_lock:
+        pool = _current_pool(workers)
+        _pool_users[pool] = _pool_users.get(pool, 0) + 1
+    try:
+        yield pool
+    finally:
+        with _pool_lock:
+            _pool_users[pool] -= 1
+            retired = not _pool_users[pool] and (_pool is None or _pool[1] is not pool)
+            if not _pool_users[pool]:
+                del _pool_users[pool]
+        if retired:
+            pool.shutdown(wait=False)
+
+
+def close_process_pools() -> None:
+    # Stops the worker processes. The next parallel run starts a fresh pool.
+    global _pool
+    with _pool_lock:
+        current, _pool = _pool, None
+    if current is not None:
+        current[1].shutdown()
+
+
+atexit.register(close_process_pools)
+
+
+def _drop_pool(pool:"futures.ProcessPoolExecutor") -> None:
+    # Stops handing out pool, unless another run has already replaced it
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool[1] is pool:
+            _pool = None
+
+
+def to_pig_latin_parallel(texts:Sequence[str], workers:int | None=None, chunksize:int=8) -> list[str]:
+    # Results come back in input order. workers=None uses one process per core.
+    if workers == 1 or len(texts) <= 1:
+        return to_pig_latin_many(texts)
+    with _using_process_pool(workers) as pool:
+        try:
+            return list(pool.map(to_pig_latin, texts, chunksize=chunksize))
+        except futures.BrokenExecutor:
+            # A worker died; retire the pool so the next run starts a working one
+            _drop_pool(pool)
+            raise
+
+
+def split_at_whitespace(text:str, shard_size:int=SHARD_SIZE) -> list[str]:
+    # Cut roughly every shard_size characters, always on a whitespace character so no word is split.
+    shards = []
+    start = 0
+    while start < len(text):
+        match = _WHITESPACE.search(text, start + shard_size)
+        if match is None:
+            shards.append(text[start:])
+            break
+        shards.append(text[start:match.start()])
+        start = match.end()
+    return shards
+
+
+def to_pig_latin_sharded(text:str, workers:int | None=None, shard_size:int=SHARD_SIZE) -> str:
+    if not text:
+        return ""
+    translated = to_pig_latin_parallel(split_at_whitespace(text, shard_size), workers=workers, chunksize=1)
+    # Shards made only of whitespace translate to "" and must not add separators.
+    return ' '.join(piece for piece in translated if piece)
@@ -0,0 +1,83 @@
+"""Small thread-safe TTL cache with optional on-disk persistence.
+
+Entries live in a bounded in-memory LRU. When a directory is given, values are also written there as JSON so they
+survive restarts and can be shared between engine processes; disk-backed values must therefore be JSON-serializable.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from cache_files import write_atomic
+
+
+class TTLCache:
+    def __init__(self, ttl:float, max_entries:int=256, directory:str | os.PathLike | None=None) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory is not None else None
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key:str) -> Any | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self._entries.pop(key, None)
+        entry = self._read_disk(key, now)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, entry)
+        return entry[1]
+
+    def set(self, key:str, value:Any) -> None:
+        entry = (time.time() + self.ttl, value)
+        with self._lock:
+            self._store(key, entry)
+        if self.directory is not None:
+            write_atomic(self._path(key), json.dumps({"expires": entry[0], "value": value}).encode("utf-8"))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+        if self.directory is not None:
+            for path in self.directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def _store(self, key:str, entry:tuple[float, Any]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key:str) -> Path:
+        return self.directory / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def _read_disk(self, key:str, now:float) -> tuple[float, Any] | None:
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            stored = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if stored.get("expires", 0) <= now:
+            path.unlink(missing_ok=True)
+            return None
+        return stored["expires"], stored.get("value")
@@ -0,0 +1,10 @@
+"""Puts the node library directory on sys.path, the way the engine does when it registers library.json, and the
+benchmarks directory too, so tests can use its stand-in servers."""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+for directory in (ROOT / "kyro_nodes_dev", ROOT / "benchmarks"):
+    if str(directory) not in sys.path:
+        sys.path.insert(0, str(directory))
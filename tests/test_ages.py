@@ -0,0 +1,16 @@
+import ages
+from ages import AGE_MAX, AGE_MIN, clamp_ages
+
+
+def test_clamp_ages_clamps_to_the_range():
+    assert clamp_ages([0, AGE_MIN, 36, AGE_MAX, 150, 12.5]) == [AGE_MIN, AGE_MIN, 36, AGE_MAX, AGE_MAX, 12.5]
+
+
+def test_clamp_ages_leaves_missing_ages():
+    assert clamp_ages([None, 200, None]) == [None, AGE_MAX, None]
+
+
+def test_ages_has_no_node_classes():
+    # Node files import it, so it must not define anything the engine would register
+    assert "griptape_nodes" not in ages.__dict__
+    assert not any(isinstance(value, type) for value in vars(ages).values())
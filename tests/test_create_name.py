@@ -0,0 +1,14 @@
+import pytest
+
+pytest.importorskip("griptape_nodes")
+
+from create_name import capitalize_names, full_names
+
+
+def test_capitalize_names_leaves_empty_and_missing_names():
+    assert capitalize_names(["ada", "", None, "Grace"]) == ["Ada", "", None, "Grace"]
+
+
+def test_full_names_rejects_columns_of_different_lengths():
+    with pytest.raises(ValueError):
+        full_names(["Ada"], ["Lovelace", "Hopper"])
@@ -0,0 +1,125 @@
+import time
+
+import pytest
+
+import http_session
+from fake_servers import FakeNasaServer
+from http_session import DownloadTooLargeError, download_to_buffer, get_session
+
+
+@pytest.fixture
+def session(monkeypatch):
+    # A fresh shared session for each test, without backoff sleeps unless a test asks for them
+    monkeypatch.setattr(http_session, "RETRY_BACKOFF_FACTOR", 0)
+    http_session.close_session()
+    yield get_session()
+    http_session.close_session()
+
+
+@pytest.fixture
+def server():
+    with FakeNasaServer(total_items=3, image_size=(64, 64)) as server:
+        yield server
+
+
+def test_get_session_is_shared(session):
+    assert get_session() is session
+
+
+def test_retries_a_503_then_succeeds(session, server):
+    server.fail_next(503)
+
+    response = session.get(f"{server.url}/search", params={"q": "apollo"})
+
+    assert response.status_code == 200
+    assert len(response.json()["collection"]["items"]) == 3
+    assert server.counts["search"] == 2
+
+
+def test_gives_up_after_the_retry_budget(session, server):
+    server.fail_next(503, times=http_session.RETRY_TOTAL + 1)
+
+    response = session.get(f"{server.url}/search")
+
+    # raise_on_status=False hands back the last response instead of a urllib3 error
+    assert response.status_code == 503
+    assert server.counts["search"] == http_session.RETRY_TOTAL + 1
+
+
+def test_honours_retry_after(session, server):
+    server.fail_next(429, headers={"Retry-After": "1"})
+
+    start = time.monotonic()
+    response = session.get(f"{server.url}/search")
+
+    assert response.status_code == 200
+    assert time.monotonic() - start >= 0.9
+    assert server.counts["search"] == 2
+
+
+def test_caps_a_long_retry_after(session, server, monkeypatch):
+    monkeypatch.setattr(http_session, "RETRY_AFTER_MAX", 0.2)
+    server.fail_next(503, headers={"Retry-After": "3600"})
+
+    start = time.monotonic()
+    response = session.get(f"{server.url}/search")
+
+    assert response.status_code == 200
+    assert time.monotonic() - start < 5
+    assert server.counts["search"] == 2
+
+
+def test_backs_off_between_retries(monkeypatch, server):
+    monkeypatch.setattr(http_session, "RETRY_BACKOFF_FACTOR", 0.2)
+    http_session.close_session()
+    server.fail_next(503, times=2)
+    try:
+        start = time.monotonic()
+        response = get_session().get(f"{server.url}/search")
+        elapsed = time.monotonic() - start
+    finally:
+        http_session.close_session()
+
+    assert response.status_code == 200
+    # No sleep before the first retry, then backoff_factor * 2 before the second
+    assert elapsed >= 0.35
+
+
+def test_post_is_not_retried(session, server):
+    server.fail_next(503)
+
+    response = session.post(f"{server.url}/search", json={"q": "apollo"})
+
+    assert response.status_code == 503
+    assert server.counts["search"] == 1
+
+
+def test_reuses_connections(session, server):
+    for _ in range(5):
+        session.get(f"{server.url}/search").raise_for_status()
+
+    assert server.counts["search"] == 5
+    assert server.counts["connections"] == 1
+
+
+def test_download_to_buffer_returns_the_body(session, server):
+    response = session.get(f"{server.url}/images/0.png", stream=True)
+
+    with download_to_buffer(response, max_bytes=len(server.image)) as buffer:
+        assert buffer.read() == server.image
+
+
+def test_download_to_buffer_rejects_oversized_body(session, server):
+    response = session.get(f"{server.url}/images/0.png", stream=True)
+
+    with pytest.raises(DownloadTooLargeError):
+        download_to_buffer(response, max_bytes=len(server.image) - 1)
+
+
+def test_download_to_buffer_rejects_oversized_body_without_content_length(session, server):
+    response = session.get(f"{server.url}/images/0.png", stream=True)
+    # A chunked response has no Content-Length, so the limit is enforced while reading
+    del response.headers["Content-Length"]
+
+    with pytest.raises(DownloadTooLargeError):
+        download_to_buffer(response, max_bytes=len(server.image) - 1)
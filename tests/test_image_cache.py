@@ -0,0 +1,72 @@
+import os
+
+import image_cache
+from image_cache import ImageCache
+
+URL = "https://images.example/{}.png"
+
+
+def put(cache:ImageCache, index:int, size:int=100):
+    return cache.put(URL.format(index), bytes([index]) * size, "png", 8, 8)
+
+
+def test_put_then_get(tmp_path):
+    cache = ImageCache(tmp_path)
+    entry = put(cache, 1)
+
+    assert cache.get(entry.url) == entry
+    assert cache.read(entry) == bytes([1]) * 100
+
+
+def test_get_is_a_miss_when_eviction_races_it(tmp_path, monkeypatch):
+    cache = ImageCache(tmp_path)
+    entry = put(cache, 1)
+
+    def evicted(path, *args, **kwargs):
+        # Another thread's eviction removed the entry between the read and the access-time update
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(image_cache.os, "utime", evicted)
+
+    assert cache.get(entry.url) is None
+
+
+def test_evicts_least_recently_used_past_the_cap(tmp_path):
+    cache = ImageCache(tmp_path, max_bytes=350)
+    for index in range(3):
+        put(cache, index)
+        # Distinct access times, oldest first
+        os.utime(tmp_path / "entries" / f"{image_cache._url_key(URL.format(index))}.json", (index, index))
+    cache.get(URL.format(0))
+
+    put(cache, 3)
+
+    assert cache.get(URL.format(1)) is None
+    assert all(cache.get(URL.format(index)) is not None for index in (0, 2, 3))
+    assert sum(path.stat().st_size for path in (tmp_path / "blobs").iterdir()) <= 350
+
+
+def test_only_scans_the_directory_when_over_the_cap(tmp_path, monkeypatch):
+    cache = ImageCache(tmp_path, max_bytes=1000)
+    put(cache, 0)
+    scans = []
+    original = ImageCache._blob_sizes
+    monkeypatch.setattr(ImageCache, "_blob_sizes", lambda self: scans.append(1) or original(self))
+
+    for index in range(1, 10):
+        put(cache, index)
+    assert scans == []
+
+    put(cache, 10)
+    assert len(scans) == 1
+    assert cache._total_bytes <= 1000
+
+
+def test_eviction_removes_blobs_without_entries(tmp_path):
+    cache = ImageCache(tmp_path, max_bytes=250)
+    (tmp_path / "blobs" / "orphan").write_bytes(b"x" * 200)
+
+    put(cache, 1)
+
+    assert not (tmp_path / "blobs" / "orphan").exists()
+    assert cache.get(URL.format(1)) is not None
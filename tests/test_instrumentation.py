@@ -0,0 +1,134 @@
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+import instrumentation
+from instrumentation import instrumented, load_jsonl, propagate_run, record_external_call
+
+
+class Node:
+    def __init__(self, name:str="node", **values) -> None:
+        self.name = name
+        self.parameter_values = dict(values)
+        self.parameter_output_values = {}
+
+    @instrumented
+    def process(self) -> str:
+        if self.parameter_values.get("fail"):
+            raise ValueError("no")
+        record_external_call("http", 2)
+        self.parameter_output_values["text"] = self.parameter_values["text"].upper()
+        return "done"
+
+
+@pytest.fixture(autouse=True)
+def metrics_on(monkeypatch):
+    for env in (instrumentation.METRICS_ENV, instrumentation.METRICS_FILE_ENV, instrumentation.PROFILE_ENV, instrumentation.PROFILE_DIR_ENV):
+        monkeypatch.delenv(env, raising=False)
+    instrumentation.configure(enabled=True)
+    instrumentation.get_registry().reset()
+    yield
+    instrumentation.configure(enabled=False)
+    instrumentation.get_registry().reset()
+
+
+def test_registry_totals_runs():
+    Node(text="hello").process()
+    with pytest.raises(ValueError):
+        Node(text="hello", fail=True).process()
+
+    stats = instrumentation.get_registry().snapshot()["Node"]
+    assert stats["runs"] == 2
+    assert stats["errors"] == 1
+    # The fail flag is a bool, which counts as no bytes
+    assert stats["bytes_in"] == 5 + 5
+    assert stats["bytes_out"] == 5
+    assert stats["external_calls"] == {"http": 2}
+
+
+def test_sink_file_aggregates_like_the_registry(tmp_path):
+    sink = tmp_path / "runs" / "metrics.jsonl"
+    instrumentation.configure(metrics_file=sink)
+    for text in ("a", "bb", "ccc"):
+        Node(text=text).process()
+
+    assert len(sink.read_text().splitlines()) == 3
+    assert load_jsonl(sink).snapshot() == instrumentation.get_registry().snapshot()
+
+
+class PoolNode(Node):
+    @instrumented
+    def process(self) -> None:
+        def call(_) -> None:
+            record_external_call("openai")
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(propagate_run(call), range(3)))
+            # Not wrapped, so not attributed to the run
+            list(pool.map(call, range(3)))
+
+
+def test_propagate_run_attributes_pool_work():
+    PoolNode().process()
+
+    assert instrumentation.get_registry().snapshot()["PoolNode"]["external_calls"] == {"openai": 3}
+
+
+class WaitingNode(Node):
+    @instrumented
+    def process(self) -> None:
+        self.parameter_values["started"].set()
+        self.parameter_values["finish"].wait(5)
+        self.parameter_output_values["data"] = bytes(1 << 16)
+
+
+def test_overlapping_runs_share_tracemalloc():
+    assert not tracemalloc.is_tracing()
+    instrumentation.configure(profile={"tracemalloc"})
+    events = {name: threading.Event() for name in ("first started", "first finish", "second started", "second finish")}
+    first = WaitingNode(name="first", started=events["first started"], finish=events["first finish"])
+    second = WaitingNode(name="second", started=events["second started"], finish=events["second finish"])
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first_run = pool.submit(first.process)
+        events["first started"].wait(5)
+        second_run = pool.submit(second.process)
+        events["second started"].wait(5)
+        # The first run ending must not stop tracing under the second
+        events["first finish"].set()
+        first_run.result(5)
+        assert tracemalloc.is_tracing()
+        events["second finish"].set()
+        second_run.result(5)
+
+    assert not tracemalloc.is_tracing()
+    assert instrumentation.get_registry().snapshot()["WaitingNode"]["errors"] == 0
+
+
+def test_unwritable_profile_dir_does_not_fail_the_node(tmp_path, monkeypatch):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setenv(instrumentation.PROFILE_DIR_ENV, str(blocker / "profiles"))
+    sink = tmp_path / "metrics.jsonl"
+    instrumentation.configure(metrics_file=sink, profile={"cprofile"})
+
+    node = Node(text="hello")
+    assert node.process() == "done"
+
+    assert node.parameter_output_values == {"text": "HELLO"}
+    assert load_jsonl(sink).snapshot()["Node"]["runs"] == 1
+    assert '"profile_path": null' in sink.read_text()
+
+
+def test_profiler_teardown_failure_keeps_the_node_result():
+    instrumentation.configure(profile={"tracemalloc"})
+
+    with mock.patch.object(tracemalloc, "take_snapshot", side_effect=RuntimeError("boom")):
+        with pytest.raises(ValueError):
+            Node(text="hello", fail=True).process()
+        assert Node(text="hello").process() == "done"
+
+    assert not tracemalloc.is_tracing()
+    assert instrumentation.get_registry().snapshot()["Node"]["runs"] == 2
@@ -0,0 +1,64 @@
+import pytest
+
+import memoization
+from memoization import memoized
+
+
+class Node:
+    runs = 0
+
+    def __init__(self, **values) -> None:
+        self.parameter_values = dict(values)
+        self.parameter_output_values = {}
+
+    @memoized(cache_size=4)
+    def process(self) -> None:
+        Node.runs += 1
+        if self.parameter_values.get("path"):
+            self.parameter_output_values["path"] = self.parameter_values["path"]
+        else:
+            self.parameter_output_values["text"] = self.parameter_values["text"].upper()
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    memoization.configure(enabled=True)
+    Node.process.memo_cache.clear()
+    Node.runs = 0
+    yield
+    memoization.configure()
+
+
+def test_hit_is_shared_across_instances():
+    Node(text="hello").process()
+    other = Node(text="hello")
+    other.process()
+
+    assert other.parameter_output_values == {"text": "HELLO"}
+    assert Node.runs == 1
+
+
+def test_cached_result_leaves_out_earlier_outputs():
+    node = Node(path="out.txt")
+    node.process()
+    node.parameter_values = {"text": "hello"}
+    node.process()
+
+    assert node.parameter_output_values == {"text": "HELLO"}
+    # Another instance that hits the cached result doesn't pick up the first instance's "path"
+    other = Node(text="hello")
+    other.process()
+
+    assert other.parameter_output_values == {"text": "HELLO"}
+    assert Node.runs == 2
+
+
+def test_hit_replaces_outputs_from_an_earlier_run():
+    Node(text="hello").process()
+    node = Node(path="out.txt")
+    node.process()
+    node.parameter_values = {"text": "hello"}
+    node.process()
+
+    assert node.parameter_output_values == {"text": "HELLO"}
+    assert Node.runs == 2
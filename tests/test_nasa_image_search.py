@@ -0,0 +1,89 @@
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("griptape_nodes")
+
+import http_session
+import nasa_image_search
+from fake_servers import FakeNasaServer
+from nasa_image_search import MAX_RESULT_COUNT, SEARCH_PAGE_SIZE, NasaImageSearchNode
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setenv("KYRO_NODES_CACHE_DIR", str(tmp_path))
+    http_session.close_session()
+    with FakeNasaServer(total_items=500, image_size=(8, 8)) as server, \
+            mock.patch.object(nasa_image_search, "NASA_API_URL", f"{server.url}/search"):
+        yield server
+    http_session.close_session()
+
+
+def search_node(**values) -> NasaImageSearchNode:
+    node = NasaImageSearchNode(name="search")
+    node.parameter_values.update(query="apollo", use_cache=False, **values)
+    return node
+
+
+def test_negative_result_index_is_rejected(server):
+    node = search_node(result_index=-1)
+
+    assert node.validate_node()
+    node.process()
+
+    assert "result_index" in node.parameter_output_values["error_message"]
+    assert node.parameter_output_values["images"] == []
+    assert server.counts["search"] == 0
+
+
+def test_result_count_is_clamped(server):
+    node = search_node(result_count=10_000)
+
+    assert node.validate_node() is None
+    node.process()
+
+    assert len(node.parameter_output_values["images"]) == MAX_RESULT_COUNT
+    assert all(node.parameter_output_values["images"])
+    assert server.counts["search"] == -(-MAX_RESULT_COUNT // SEARCH_PAGE_SIZE)
+    assert server.counts["images"] == MAX_RESULT_COUNT
+
+
+@pytest.mark.parametrize("max_image_mb", [0, -5])
+def test_non_positive_max_image_mb_is_rejected(server, max_image_mb):
+    node = search_node(max_image_mb=max_image_mb)
+
+    assert node.validate_node()
+    node.process()
+
+    assert "max_image_mb" in node.parameter_output_values["error_message"]
+    assert server.counts["images"] == 0
+
+
+def test_max_image_mb_limits_the_download(server):
+    # About 10 bytes, smaller than any PNG the fake server can send
+    node = search_node(max_image_mb=0.00001)
+
+    node.process()
+
+    assert node.parameter_output_values["image"] is None
+    assert "limit" in node.parameter_output_values["error_message"]
+
+
+def test_max_image_mb_defaults_when_unset(server):
+    node = search_node(max_image_mb=None)
+
+    node.process()
+
+    assert node.parameter_output_values["error_message"] is None
+    assert node.parameter_output_values["image"] is not None
+
+
+def test_results_are_transcoded_in_the_download_threads(server):
+    node = search_node(result_count=3, max_dimension=4, output_format="webp")
+    node.process()
+
+    images = node.parameter_output_values["images"]
+    assert not node.parameter_output_values.get("error_message")
+    assert len(images) == 3
+    assert all(image.format == "webp" and max(image.width, image.height) <= 4 for image in images)
@@ -0,0 +1,113 @@
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("griptape_nodes")
+
+import openai_chat
+from fake_servers import FakeOpenAIServer
+from openai_client import DEFAULT_MODEL, RateLimiter, close_clients, driver_settings, prompt_driver
+from openai_chat import OpenAIChat, OpenAIChatBatch
+from response_cache import ResponseCache, response_key
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with FakeOpenAIServer(words=5) as server:
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        close_clients()
+        yield server
+        close_clients()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite3")
+    with mock.patch.object(openai_chat, "get_response_cache", return_value=cache):
+        yield cache
+
+
+def chat_node(**values) -> OpenAIChat:
+    node = OpenAIChat(name="chat")
+    node.get_config_value = mock.Mock(return_value="sk-test")
+    node.parameter_values.update(prompt="Hello", **values)
+    return node
+
+
+def cache_key(prompt:str) -> str:
+    return response_key(prompt, DEFAULT_MODEL, driver_settings(prompt_driver("sk-test", DEFAULT_MODEL)))
+
+
+def test_response_is_cached(server, cache):
+    node = chat_node(**{"use cache": True})
+    node.process()
+
+    assert node.parameter_output_values["output"]
+    assert cache.get(cache_key("Hello")) == node.parameter_output_values["output"]
+
+
+def test_failed_response_is_raised_and_not_cached(server, cache):
+    # Enough failures to outlast every retry the driver and the client make
+    server.fail_next(500, times=20, headers={"retry-after-ms": "0"})
+    node = chat_node(**{"use cache": True})
+
+    with pytest.raises(RuntimeError):
+        node.process()
+
+    assert cache.get(cache_key("Hello")) is None
+
+
+def batch_node(prompts:list[str], **values) -> OpenAIChatBatch:
+    node = OpenAIChatBatch(name="batch")
+    node.get_config_value = mock.Mock(return_value="sk-test")
+    node.parameter_values.update(prompts=prompts, **values)
+    return node
+
+
+def test_batch_retries_go_through_the_rate_limiter(server):
+    # The driver and the client would otherwise retry on their own, making requests the limiter never sees
+    server.fail_next(500, times=2)
+    node = batch_node(["Hello"], **{"max retries": 1})
+
+    with mock.patch.object(RateLimiter, "acquire", autospec=True) as acquire:
+        node.process()
+
+    assert node.parameter_output_values["outputs"] == [None]
+    assert node.parameter_output_values["errors"][0]
+    assert server.counts["v1/chat/completions"] == acquire.call_count == 2
+
+
+def test_batch_retry_recovers(server):
+    server.fail_next(500)
+    node = batch_node(["Hello"], **{"max retries": 1})
+    node.process()
+
+    assert node.parameter_output_values["outputs"][0]
+    assert node.parameter_output_values["errors"] == [None]
+    assert server.counts["v1/chat/completions"] == 2
+
+
+@pytest.mark.parametrize("node_class", [OpenAIChat, OpenAIChatBatch])
+def test_missing_key_fails_validation(server, monkeypatch, node_class):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    node = node_class(name="chat")
+    node.get_config_value = mock.Mock(return_value=None)
+
+    errors = node.validate_node()
+
+    assert len(errors) == 1 and "Missing credentials" in str(errors[0])
+
+
+def test_missing_key_uses_the_environment(server, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-from-env")
+    node = chat_node()
+    node.get_config_value.return_value = None
+
+    assert node.validate_node() is None
+    node.process()
+    assert node.parameter_output_values["output"]
+
+    batch = batch_node(["Hello"])
+    batch.get_config_value.return_value = None
+    batch.process()
+    assert batch.parameter_output_values["outputs"][0]
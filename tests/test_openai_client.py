@@ -0,0 +1,103 @@
+import threading
+import time
+
+import openai
+import pytest
+
+import openai_client
+from fake_servers import FakeOpenAIServer
+from openai_client import VALIDATION_TTL, close_clients, get_client, validate_api_key
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with FakeOpenAIServer(words=5) as server:
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        close_clients()
+        yield server
+        close_clients()
+
+
+def test_get_client_is_shared_per_key(server):
+    client = get_client("sk-one")
+
+    assert get_client("sk-one") is client
+    assert get_client("sk-two") is not client
+    assert get_client("sk-two").api_key == "sk-two"
+
+
+def test_nodes_sharing_a_key_validate_it_once(server):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(validate_api_key("sk-shared"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.append(validate_api_key("sk-shared"))
+
+    assert results == [None] * 9
+    assert server.counts["v1/models"] == 1
+
+
+def test_rejected_key_is_cached(server):
+    error = validate_api_key("invalid")
+
+    assert isinstance(error, openai.AuthenticationError)
+    assert validate_api_key("invalid") is error
+    assert server.counts["v1/models"] == 1
+
+
+def test_connection_error_is_not_cached(monkeypatch):
+    # A server that has already shut down refuses the connection
+    with FakeOpenAIServer() as server:
+        base_url = server.base_url
+    monkeypatch.setenv("OPENAI_BASE_URL", base_url)
+    close_clients()
+    try:
+        error = validate_api_key("sk-offline")
+
+        assert isinstance(error, openai.APIConnectionError)
+        assert openai_client.validation_cache.get(openai_client._key_id("sk-offline")) is None
+    finally:
+        close_clients()
+
+
+def test_server_error_is_checked_again(server):
+    # More failures than the SDK's own retries, so validation sees the error
+    server.fail_next(500, times=get_client("sk-flaky").max_retries + 1)
+
+    assert isinstance(validate_api_key("sk-flaky"), openai.InternalServerError)
+    assert validate_api_key("sk-flaky") is None
+    assert server.counts["v1/models"] == get_client("sk-flaky").max_retries + 2
+
+
+def test_validation_expires_after_the_ttl(server, monkeypatch):
+    assert openai_client.validation_cache.ttl == VALIDATION_TTL == 15 * 60
+    # Entries take their expiry from the cache's ttl when stored, so a short ttl stands in for 15 minutes
+    monkeypatch.setattr(openai_client.validation_cache, "ttl", 0.2)
+
+    validate_api_key("sk-ttl")
+    validate_api_key("sk-ttl")
+    assert server.counts["v1/models"] == 1
+
+    time.sleep(0.3)
+    validate_api_key("sk-ttl")
+    assert server.counts["v1/models"] == 2
+
+
+@pytest.mark.parametrize("api_key", [None, ""])
+def test_missing_key_is_reported(server, monkeypatch, api_key):
+    monkeypatch.delenv(openai_client.API_KEY_ENV, raising=False)
+
+    error = validate_api_key(api_key)
+
+    assert isinstance(error, openai.OpenAIError)
+    assert "Missing credentials" in str(error)
+    assert server.counts["v1/models"] == 0
+
+
+def test_missing_key_falls_back_to_the_environment(server, monkeypatch):
+    monkeypatch.setenv(openai_client.API_KEY_ENV, "sk-from-env")
+
+    assert validate_api_key(None) is None
+    assert get_client(None) is get_client("sk-from-env")
@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("griptape_nodes")
+
+from parameter_specs import ParameterSpec
+
+
+def test_each_parameter_gets_its_own_ui_options():
+    spec = ParameterSpec(name="age", tooltip="Age", ui_options={"slider": {"min_val": 1, "max_val": 98}})
+    first, second = spec.build(), spec.build()
+
+    first.ui_options["slider"]["max_val"] = 50
+
+    assert second.ui_options["slider"]["max_val"] == 98
+    assert spec.ui_options["slider"]["max_val"] == 98
+
+
+
+def test_ui_options_factory_is_called_per_parameter():
+    spec = ParameterSpec(name="image", tooltip="Image", ui_options=lambda: {"expander": True})
+    first, second = spec.build(), spec.build()
+
+    assert first.ui_options == {"expander": True}
+    assert first.ui_options is not second.ui_options
+
+
+def test_deeply_nested_ui_options_need_a_factory():
+    with pytest.raises(TypeError, match="factory"):
+        ParameterSpec(name="age", tooltip="Age", ui_options={"slider": {"range": {"min_val": 1}}})
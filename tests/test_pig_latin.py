@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("griptape_nodes")
+
+import memoization
+from pig_latin import ConvertToPigLatin
+
+
+@pytest.fixture(autouse=True)
+def no_memoization():
+    memoization.configure(enabled=False)
+    yield
+    memoization.configure()
+
+
+def test_file_mode_clears_string_output(tmp_path):
+    document = tmp_path / "doc.txt"
+    document.write_text("hello world", encoding="utf-8")
+    node = ConvertToPigLatin(name="pig")
+    node.parameter_values["input"] = "string mode"
+    node.process()
+    assert node.parameter_output_values["pig latin"] == "ingstray odemay"
+
+    node.parameter_values["input file"] = str(document)
+    node.process()
+
+    assert node.parameter_output_values["pig latin"] is None
+    assert (tmp_path / "doc.pig_latin.txt").read_text(encoding="utf-8") == "ellohay orldway"
@@ -0,0 +1,70 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import pig_latin_engine
+from pig_latin_engine import close_process_pools, get_process_pool, pig_latin_file, to_pig_latin, to_pig_latin_many, to_pig_latin_parallel
+
+
+def test_pig_latin_file_can_overwrite_its_input(tmp_path):
+    document = tmp_path / "doc.txt"
+    text = "Hello world, this is a string! " * 500
+    document.write_text(text, encoding="utf-8")
+
+    # A small chunk size keeps reading the input long after the output is first written
+    pig_latin_file(document, document, chunk_size=7)
+
+    assert document.read_text(encoding="utf-8") == to_pig_latin(text)
+    assert os.listdir(tmp_path) == ["doc.txt"]
+
+
+def test_pig_latin_file_failure_leaves_existing_output(tmp_path):
+    output = tmp_path / "out.txt"
+    output.write_text("previous", encoding="utf-8")
+
+    with pytest.raises(FileNotFoundError):
+        pig_latin_file(tmp_path / "missing.txt", output)
+
+    assert output.read_text(encoding="utf-8") == "previous"
+    assert os.listdir(tmp_path) == ["out.txt"]
+
+
+def test_parallel_runs_reuse_one_spawned_pool():
+    texts = [f"Document number {index}, with a few words." for index in range(8)]
+    try:
+        assert to_pig_latin_parallel(texts, workers=2, chunksize=2) == to_pig_latin_many(texts)
+        pool = get_process_pool(2)
+        assert to_pig_latin_parallel(texts, workers=2) == to_pig_latin_many(texts)
+        assert get_process_pool(2) is pool
+        assert pool._mp_context.get_start_method() == "spawn"
+    finally:
+        close_process_pools()
+
+
+def test_new_worker_count_replaces_the_pool():
+    texts = [f"Document number {index}, with a few words." for index in range(8)]
+    try:
+        to_pig_latin_parallel(texts, workers=2)
+        old = get_process_pool(2)
+        assert to_pig_latin_parallel(texts, workers=3) == to_pig_latin_many(texts)
+
+        assert get_process_pool(3) is not old
+        # The replaced pool was shut down rather than left idle
+        with pytest.raises(RuntimeError):
+            old.submit(to_pig_latin, "hello")
+    finally:
+        close_process_pools()
+
+
+def test_concurrent_runs_with_different_worker_counts():
+    texts = [f"Document number {index}, with a few words." for index in range(16)]
+    expected = to_pig_latin_many(texts)
+    try:
+        with ThreadPoolExecutor(max_workers=4) as threads:
+            results = list(threads.map(lambda workers: to_pig_latin_parallel(texts, workers=workers), [2, 3, 2, 3]))
+        assert results == [expected] * 4
+        # Pools replaced while in use were shut down once their runs finished
+        assert not pig_latin_engine._pool_users
+    finally:
+        close_process_pools()